@@ -0,0 +1,55 @@
+"""
+Benchmark waktu parsing per halaman untuk setiap backend parser.
+
+    python -m benchmarks.bench_parsers --pages 20 --products 20
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.pages import render_page
+from utils.cache import SelectorMemo
+from utils.extract import PARSERS, _extract_with_patterns, _find_cards, _make_soup, _resolve_parser
+
+
+def bench_parser(parser: str, pages: list[str], memo: SelectorMemo | None = None) -> dict:
+    start = time.perf_counter()
+    n_cards = 0
+    for html in pages:
+        soup = _make_soup(html, parser)
+        for card in _find_cards(soup, memo):
+            _extract_with_patterns(card)
+            n_cards += 1
+    elapsed = time.perf_counter() - start
+    return {
+        "parser": parser,
+        "pages": len(pages),
+        "cards": n_cards,
+        "ms_per_page": elapsed / len(pages) * 1000,
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--pages", type=int, default=20)
+    ap.add_argument("--products", type=int, default=20)
+    args = ap.parse_args()
+
+    pages = [render_page(p, args.products) for p in range(1, args.pages + 1)]
+    for parser in PARSERS:
+        if _resolve_parser(parser) != parser:
+            print(f"{parser:<18} tidak terpasang, dilewati")
+            continue
+        r = bench_parser(parser, pages)
+        print(f"{r['parser']:<18} {r['ms_per_page']:8.2f} ms/page  ({r['cards']} kartu)")
+        with tempfile.TemporaryDirectory() as tmp:
+            memo = SelectorMemo(os.path.join(tmp, "selectors.json"))
+            r = bench_parser(parser, pages, memo)
+        print(f"{parser + '+memo':<18} {r['ms_per_page']:8.2f} ms/page  ({r['cards']} kartu)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""
+Benchmark end-to-end: extract dari server sintetis lokal, transform, lalu
+setiap loader. Hasil disimpan sebagai JSON (beserta commit git) supaya
+regresi antar commit terlihat.
+
+    python -m benchmarks.bench_pipeline --pages 50 --products 20 --workers 8 --latency 0.05
+    python -m benchmarks.bench_pipeline --pages 200 --products 100 --parse-workers 4
+    python -m benchmarks.bench_pipeline --pg-dsn "host=localhost dbname=bench user=postgres"
+    python -m benchmarks.bench_pipeline --baseline benchmarks/results/pipeline-lama.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import platform
+import subprocess
+import tempfile
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+import pandas as pd
+
+from benchmarks.server import ServerConfig, SyntheticServer
+from utils.extract import DEFAULT_PARSER, extract_all
+from utils.transform import DEFAULT_ENGINE, transform
+
+RESULTS_DIR = os.path.join("benchmarks", "results")
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def _timed(fn: Callable[[], Any]) -> tuple[Any, float]:
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def _stage(seconds: float, rows: int) -> Dict[str, float]:
+    return {
+        "seconds": round(seconds, 4),
+        "rows": rows,
+        "rows_per_sec": round(rows / seconds, 1) if seconds > 0 else None,
+    }
+
+
+def _parse_dsn(dsn: str) -> Dict[str, str]:
+    """
+    "host=localhost dbname=bench user=postgres" -> kwargs psycopg2.connect.
+    """
+    config = dict(part.split("=", 1) for part in dsn.split())
+    if "dbname" in config:
+        config["database"] = config.pop("dbname")
+    return config
+
+
+def bench_loaders(df: pd.DataFrame, pg_config: Optional[Dict[str, str]]) -> Dict[str, Any]:
+    from utils.load import load_to_csv, load_to_parquet, load_to_postgres
+
+    results: Dict[str, Any] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        _, seconds = _timed(lambda: load_to_csv(df, directory=tmp))
+        results["csv"] = _stage(seconds, len(df))
+        _, seconds = _timed(lambda: load_to_csv(df, "products.csv.gz", directory=tmp))
+        results["csv_gzip"] = _stage(seconds, len(df))
+        try:
+            _, seconds = _timed(lambda: load_to_parquet(df, os.path.join(tmp, "parquet")))
+            results["parquet"] = _stage(seconds, len(df))
+        except ImportError as e:
+            results["parquet"] = {"skipped": str(e)}
+
+    if not pg_config:
+        results["postgres"] = {"skipped": "--pg-dsn tidak diisi"}
+        return results
+    for method in ("copy", "values"):
+        table = f"bench_products_{method}"
+        try:
+            _, seconds = _timed(lambda: load_to_postgres(df, pg_config, table, method=method))
+            results[f"postgres_{method}"] = _stage(seconds, len(df))
+        except Exception as e:
+            results[f"postgres_{method}"] = {"error": str(e)}
+    return results
+
+
+def run_benchmark(
+    config: ServerConfig,
+    workers: int = 8,
+    parse_workers: int = 0,
+    parser: str = DEFAULT_PARSER,
+    engine: str = DEFAULT_ENGINE,
+    pg_config: Optional[Dict[str, str]] = None,
+) -> Dict[str, Any]:
+    """
+    Jalankan satu benchmark lengkap dan kembalikan hasilnya sebagai dict.
+    """
+    with SyntheticServer(config) as server:
+        rows, extract_seconds = _timed(
+            lambda: extract_all(
+                config.pages, workers, parser=parser, base_url=server.base_url, parse_workers=parse_workers
+            )
+        )
+    df, transform_seconds = _timed(lambda: transform(rows, engine=engine))
+
+    return {
+        "commit": _git_commit(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "params": {
+            "pages": config.pages,
+            "products": config.products,
+            "latency": config.latency,
+            "error_rate": config.error_rate,
+            "workers": workers,
+            "parse_workers": parse_workers,
+            "parser": parser,
+            "engine": engine,
+        },
+        "stages": {
+            "extract": {**_stage(extract_seconds, len(rows)), "pages_per_sec": round(config.pages / extract_seconds, 1)},
+            "transform": _stage(transform_seconds, len(df)),
+            "load": bench_loaders(df, pg_config),
+        },
+    }
+
+
+def _flatten(stages: Dict[str, Any], prefix: str = "") -> Dict[str, float]:
+    flat: Dict[str, float] = {}
+    for name, value in stages.items():
+        if isinstance(value, dict) and "seconds" in value:
+            flat[prefix + name] = value["seconds"]
+        elif isinstance(value, dict):
+            flat.update(_flatten(value, f"{prefix}{name}."))
+    return flat
+
+
+def compare(result: Dict[str, Any], baseline: Dict[str, Any]) -> None:
+    now, before = _flatten(result["stages"]), _flatten(baseline["stages"])
+    print(f"\nDibanding {baseline.get('commit')} ({baseline.get('timestamp')}):")
+    for name, seconds in now.items():
+        if before.get(name):
+            print(f"  {name:<18} {before[name]:8.3f} s -> {seconds:8.3f} s  ({seconds / before[name]:5.2f}x)")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--pages", type=int, default=50)
+    ap.add_argument("--products", type=int, default=20)
+    ap.add_argument("--latency", type=float, default=0.0, help="jeda server per request (detik)")
+    ap.add_argument("--error-rate", type=float, default=0.0, help="peluang server menjawab 503")
+    ap.add_argument("--workers", type=int, default=8)
+    ap.add_argument("--parse-workers", type=int, default=0, help="jumlah proses parsing (0 = di thread fetch)")
+    ap.add_argument("--parser", default=DEFAULT_PARSER)
+    ap.add_argument("--engine", default=DEFAULT_ENGINE)
+    ap.add_argument("--pg-dsn", default=os.getenv("BENCH_PG_DSN"), help="PostgreSQL lokal untuk benchmark loader")
+    ap.add_argument("--output", default=None, help=f"file JSON hasil (default: {RESULTS_DIR}/pipeline-<waktu>-<commit>.json)")
+    ap.add_argument("--baseline", default=None, help="file JSON hasil sebelumnya untuk dibandingkan")
+    args = ap.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+
+    config = ServerConfig(args.pages, args.products, args.latency, args.error_rate)
+    pg_config = _parse_dsn(args.pg_dsn) if args.pg_dsn else None
+    result = run_benchmark(config, args.workers, args.parse_workers, args.parser, args.engine, pg_config)
+
+    output = args.output
+    if not output:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        output = os.path.join(RESULTS_DIR, f"pipeline-{stamp}-{result['commit'] or 'nogit'}.json")
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2)
+
+    for name, seconds in _flatten(result["stages"]).items():
+        print(f"{name:<18} {seconds:8.3f} s")
+    print(f"Hasil disimpan ke {output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            compare(result, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
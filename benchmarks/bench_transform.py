@@ -0,0 +1,63 @@
+"""
+Benchmark transform() untuk setiap engine pada beberapa ukuran data.
+
+    python -m benchmarks.bench_transform --rows 10000,1000000,10000000
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import random
+import time
+from datetime import datetime, timedelta
+
+from benchmarks.pages import GENDERS, PRODUCT_TYPES, SIZES
+from utils.transform import ENGINES, transform
+
+SAMPLE_SIZE = 50_000
+
+
+def make_rows(n: int, seed: int = 0) -> list[dict]:
+    """
+    Baris mentah seperti hasil extract_all. Sampel unik dibuat sekali lalu
+    diulang (referensi yang sama) agar 10 juta baris tetap muat di memori.
+    """
+    rng = random.Random(seed)
+    base = datetime(2025, 8, 19, 12, 0, 0)
+    sample = [
+        {
+            "Title": f"{rng.choice(PRODUCT_TYPES)} {i}",
+            "Price": f"${rng.uniform(10, 500):.2f}",
+            "Rating": f"Rating: ⭐ {rng.uniform(1, 5):.1f} / 5",
+            "Colors": f"{rng.randint(1, 8)} Colors",
+            "Size": f"Size: {rng.choice(SIZES)}",
+            "Gender": f"Gender: {rng.choice(GENDERS)}",
+            "Timestamp": (base + timedelta(seconds=i)).isoformat(),
+        }
+        for i in range(min(n, SAMPLE_SIZE))
+    ]
+    return [sample[i % len(sample)] for i in range(n)]
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--rows", default="10000,1000000,10000000", help="ukuran data, dipisah koma")
+    ap.add_argument("--engines", default=",".join(ENGINES))
+    args = ap.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+
+    for n in [int(x) for x in args.rows.split(",")]:
+        rows = make_rows(n)
+        timings = {}
+        for engine in args.engines.split(","):
+            start = time.perf_counter()
+            transform(rows, engine=engine)
+            timings[engine] = time.perf_counter() - start
+            print(f"{n:>10} baris  {engine:<12} {timings[engine]:8.3f} s")
+        if "python" in timings and "vectorized" in timings:
+            print(f"{'':>10}        speedup      {timings['python'] / timings['vectorized']:8.2f}x")
+        del rows
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Generator halaman katalog sintetis dengan layout yang sama seperti
+fashion-studio.dicoding.dev, dipakai oleh skrip benchmark.
+"""
+from __future__ import annotations
+
+import random
+
+PRODUCT_TYPES = ["T-shirt", "Hoodie", "Pants", "Outerwear", "Jacket", "Shoes"]
+SIZES = ["S", "M", "L", "XL", "XXL"]
+GENDERS = ["Men", "Women", "Unisex"]
+
+
+def render_card(rng: random.Random, index: int) -> str:
+    if rng.random() < 0.02:
+        return (
+            '<div class="collection-card"><div style="position: relative;">'
+            '<img src="https://picsum.photos/280/350?random=0" class="collection-image" alt="Unknown Product"></div>'
+            '<div class="product-details"><h3 class="product-title">Unknown Product</h3>'
+            '<p class="price">Price Unavailable</p>'
+            '<p style="font-size: 14px; color: #777;">Rating: Invalid Rating / 5</p>'
+            '<p style="font-size: 14px; color: #777;">5 Colors</p>'
+            '<p style="font-size: 14px; color: #777;">Size: M</p>'
+            '<p style="font-size: 14px; color: #777;">Gender: Men</p></div></div>'
+        )
+    title = f"{rng.choice(PRODUCT_TYPES)} {index}"
+    return (
+        '<div class="collection-card"><div style="position: relative;">'
+        f'<img src="https://picsum.photos/280/350?random={index}" class="collection-image" alt="{title}"></div>'
+        f'<div class="product-details"><h3 class="product-title">{title}</h3>'
+        f'<div class="price-container"><span class="price">${rng.uniform(10, 500):.2f}</span></div>'
+        f'<p style="font-size: 14px; color: #777;">Rating: ⭐ {rng.uniform(1, 5):.1f} / 5</p>'
+        f'<p style="font-size: 14px; color: #777;">{rng.randint(1, 8)} Colors</p>'
+        f'<p style="font-size: 14px; color: #777;">Size: {rng.choice(SIZES)}</p>'
+        f'<p style="font-size: 14px; color: #777;">Gender: {rng.choice(GENDERS)}</p></div></div>'
+    )
+
+
+def render_page(page: int, products: int = 20, seed: int = 0) -> str:
+    """
+    HTML satu halaman katalog berisi `products` kartu produk (deterministik per page+seed).
+    """
+    rng = random.Random(seed * 100003 + page)
+    start = (page - 1) * products
+    cards = "\n".join(render_card(rng, start + i + 1) for i in range(products))
+    return (
+        "<!DOCTYPE html><html lang=\"en\"><head><meta charset=\"UTF-8\"><title>Fashion Studio</title></head>"
+        "<body><div class=\"container\"><h1>Our Collection</h1>"
+        f"<div id=\"collectionList\" class=\"collection-grid\">{cards}</div>"
+        f"<ul class=\"pagination\"><li class=\"page-item current\"><span class=\"page-link\">{page}</span></li></ul>"
+        "</div></body></html>"
+    )
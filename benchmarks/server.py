@@ -0,0 +1,110 @@
+"""
+Server HTTP lokal yang menyajikan halaman katalog sintetis (layout sama
+dengan fashion-studio) untuk benchmark end-to-end.
+
+    python -m benchmarks.server --port 8000 --latency 0.05 --error-rate 0.02
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from benchmarks.pages import render_page
+
+_PATH_RE = re.compile(r"^/(?:page(\d+))?/?$")
+
+
+@dataclass
+class ServerConfig:
+    pages: int = 50
+    products: int = 20
+    latency: float = 0.0
+    error_rate: float = 0.0
+    seed: int = 0
+
+
+def _make_handler(config: ServerConfig):
+    rng = random.Random(config.seed)
+    rng_lock = threading.Lock()
+    cache: dict[int, bytes] = {}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            m = _PATH_RE.match(self.path)
+            page = int(m.group(1) or 1) if m else 0
+            if config.latency:
+                time.sleep(config.latency)
+            if not 1 <= page <= config.pages:
+                self.send_error(404)
+                return
+            with rng_lock:
+                fail = rng.random() < config.error_rate
+            if fail:
+                self.send_error(503)
+                return
+            if page not in cache:
+                cache[page] = render_page(page, config.products, config.seed).encode("utf-8")
+            body = cache[page]
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+class SyntheticServer:
+    """
+    Context manager: jalankan server di thread latar, alamatnya di `base_url`.
+    """
+
+    def __init__(self, config: ServerConfig | None = None, host: str = "127.0.0.1", port: int = 0):
+        self.config = config or ServerConfig()
+        self._httpd = ThreadingHTTPServer((host, port), _make_handler(self.config))
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="bench-server", daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "SyntheticServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        self._thread.join()
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--port", type=int, default=8000)
+    ap.add_argument("--pages", type=int, default=50)
+    ap.add_argument("--products", type=int, default=20)
+    ap.add_argument("--latency", type=float, default=0.0, help="jeda per request (detik)")
+    ap.add_argument("--error-rate", type=float, default=0.0, help="peluang respons 503")
+    args = ap.parse_args()
+
+    config = ServerConfig(args.pages, args.products, args.latency, args.error_rate)
+    with SyntheticServer(config, port=args.port) as server:
+        print(f"Server sintetis berjalan di {server.base_url} (Ctrl+C untuk berhenti)")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,31 +1,214 @@
+import argparse
 import os
+import sys
 from dotenv import load_dotenv
-from utils.extract import extract_all
-from utils.transform import transform
-from utils.load import load_to_csv, load_to_gsheets, load_to_postgres
+from utils.archive import PageArchive, parse_as_of
+from utils.cache import PageCache, SelectorMemo
+from utils.checkpoint import CheckpointStore
+from utils.extract import extract_all, BASE_URL, MAX_WORKERS, DEFAULT_PARSER, PARSERS, TOTAL_PAGES
+from utils.fingerprint import FingerprintIndex
+from utils.metrics import REGISTRY
+from utils.profiling import StageProfiler
+from utils.throttle import AdaptiveThrottle
+from utils.transform import transform, DEFAULT_ENGINE, ENGINES
+from utils.pipeline import SINKS, build_sinks, build_writers, run_sinks, run_streaming, snapshot_sinks
 
-load_dotenv()
+DEFAULT_SINKS = "csv,gsheets,postgres"
 
-if __name__ == "__main__":
-    raw_data = extract_all()
-    clean_df = transform(raw_data)
-    
-    load_to_csv(clean_df)
-    
-    SPREADSHEET_ID = os.getenv("SPREADSHEET_ID")
-    
-    if not SPREADSHEET_ID:
-        raise ValueError("Error: SPREADSHEET_ID tidak ditemukan. Pastikan file .env sudah benar.")
-        
-    load_to_gsheets(clean_df, spreadsheet_id=SPREADSHEET_ID)
-
-    db_config = {
-        "host": os.getenv("DB_HOST"),
-        "database": os.getenv("DB_DATABASE"),
-        "user": os.getenv("DB_USER"),
-        "password": os.getenv("DB_PASSWORD"),
-        "port": int(os.getenv("DB_PORT", 5432))
+
+def _env_flag(name):
+    return os.getenv(name, "").lower() in ("1", "true", "yes")
+
+
+def _as_of_arg(value):
+    try:
+        return parse_as_of(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"timestamp ISO tidak valid: {value!r} (contoh: 2025-08-20 atau 2025-08-20T12:00+07:00)"
+        )
+
+
+def _already_seen_rows():
+    return REGISTRY.value("etl_transform_rows_dropped_total", reason="already_seen") or 0
+
+
+def build_parser():
+    """
+    Opsi CLI. Default setiap opsi diambil dari variabel environment lama
+    (MAX_WORKERS, STREAMING, PAGE_CACHE_DIR, ...) supaya .env yang sudah
+    ada tetap berlaku; kredensial (SPREADSHEET_ID, DB_*) tetap dari env.
+    """
+    env = os.getenv
+    ap = argparse.ArgumentParser(description="ETL produk fashion-studio: extract, transform, load.")
+    ap.add_argument("--sinks", default=env("SINKS", DEFAULT_SINKS),
+                    help=f"sink dipisah koma, pilihan: {', '.join(SINKS)} (default: {DEFAULT_SINKS})")
+    ap.add_argument("--base-url", default=env("BASE_URL", BASE_URL))
+    ap.add_argument("--pages", type=int, default=int(env("PAGES", TOTAL_PAGES)))
+    ap.add_argument("--workers", type=int, default=int(env("MAX_WORKERS", MAX_WORKERS)),
+                    help="jumlah halaman yang diambil bersamaan")
+    ap.add_argument("--parse-workers", type=int, default=int(env("PARSE_WORKERS", 0)),
+                    help="jumlah proses untuk parsing HTML (0 = di thread fetch)")
+    ap.add_argument("--parser", default=env("HTML_PARSER", DEFAULT_PARSER), choices=("auto",) + PARSERS)
+    ap.add_argument("--engine", default=env("TRANSFORM_ENGINE", DEFAULT_ENGINE), choices=ENGINES)
+    ap.add_argument("--streaming", action="store_true", default=_env_flag("STREAMING"),
+                    help="transform dan load per halaman")
+    ap.add_argument("--cache-dir", default=env("PAGE_CACHE_DIR"), help="cache halaman untuk conditional GET")
+    ap.add_argument("--selector-memo", default=env("SELECTOR_MEMO"), help="file memo selector card")
+    ap.add_argument("--archive", default=env("PAGE_ARCHIVE"), help="arsip HTML mentah (.jsonl.gz) yang ditulis saat scraping")
+    ap.add_argument("--replay", action="store_true", default=_env_flag("REPLAY"),
+                    help="baca halaman dari --archive, tanpa request ke network")
+    ap.add_argument("--replay-as-of", type=_as_of_arg, default=env("REPLAY_AS_OF"),
+                    help="putar ulang scrape terakhir sampai timestamp ISO ini (default: scrape terbaru)")
+    ap.add_argument("--checkpoint-dir", default=env("CHECKPOINT_DIR"))
+    ap.add_argument("--resume", action="store_true", default=_env_flag("RESUME"),
+                    help="lanjutkan dari checkpoint")
+    ap.add_argument("--request-rate", type=float, default=float(env("REQUEST_RATE", 0)) or None,
+                    help="laju awal throttle adaptif (request/detik)")
+    ap.add_argument("--seen-index", default=env("SEEN_INDEX"), help="file SQLite indeks produk yang sudah dimuat")
+    ap.add_argument("--seen-max-age-days", type=float, default=float(env("SEEN_MAX_AGE_DAYS", 0)) or None)
+    ap.add_argument("--csv-file", default=env("CSV_FILE", "products.csv"))
+    ap.add_argument("--csv-mode", default=env("CSV_MODE", "snapshot"), choices=("snapshot", "append"),
+                    help="snapshot mengganti file CSV, append menambahkan baris")
+    ap.add_argument("--parquet-dir", default=env("PARQUET_DIR"))
+    ap.add_argument("--pg-table", default=env("PG_TABLE", "etl_data"))
+    ap.add_argument("--pg-mode", default=env("PG_MODE", "append"), choices=("append", "upsert"))
+    ap.add_argument("--pg-dedupe-existing", action="store_true", default=_env_flag("PG_DEDUPE_EXISTING"),
+                    help="upsert pertama: hapus duplikat lama dari mode append, simpan baris terbaru per produk")
+    ap.add_argument("--pg-method", default=env("PG_METHOD", "copy"), choices=("copy", "values"))
+    ap.add_argument("--metrics-json", default=env("METRICS_JSON"))
+    ap.add_argument("--metrics-prom", default=env("METRICS_PROM"))
+    ap.add_argument("--profile-dir", default=env("PROFILE_DIR"), help="aktifkan profiling per tahap")
+    return ap
+
+
+def sink_options(args):
+    """
+    Opsi untuk sink registry; kredensial hanya dibaca bila sink-nya dipilih.
+    """
+    sinks = [s.strip() for s in args.sinks.split(",") if s.strip()]
+    options = {
+        "csv_filename": args.csv_file,
+        "csv_mode": args.csv_mode,
+        "parquet_dir": args.parquet_dir,
+        "pg_table": args.pg_table,
+        "pg_mode": args.pg_mode,
+        "pg_method": args.pg_method,
+        "pg_dedupe_existing": args.pg_dedupe_existing,
     }
-    load_to_postgres(clean_df, db_config)
+    if "gsheets" in sinks:
+        options["spreadsheet_id"] = os.getenv("SPREADSHEET_ID")
+        if not options["spreadsheet_id"]:
+            raise ValueError("Error: SPREADSHEET_ID tidak ditemukan. Pastikan file .env sudah benar.")
+    if "postgres" in sinks:
+        options["db_config"] = {
+            "host": os.getenv("DB_HOST"),
+            "database": os.getenv("DB_DATABASE"),
+            "user": os.getenv("DB_USER"),
+            "password": os.getenv("DB_PASSWORD"),
+            "port": int(os.getenv("DB_PORT", 5432))
+        }
+    return sinks, options
+
 
-    print("Proses ETL selesai dengan sukses!")
\ No newline at end of file
+def main(argv=None):
+    load_dotenv()
+    ap = build_parser()
+    args = ap.parse_args(argv)
+    if args.replay and not args.archive:
+        ap.error("--replay membutuhkan --archive")
+    if args.replay_as_of and not args.replay:
+        ap.error("--replay-as-of hanya berlaku bersama --replay")
+    sinks, options = sink_options(args)
+    if args.seen_index and snapshot_sinks(sinks, options):
+        ap.error(
+            f"--seen-index hanya untuk sink yang menambah baris (postgres, csv dengan --csv-mode append); "
+            f"sink berikut mengganti seluruh isinya: {', '.join(snapshot_sinks(sinks, options))}"
+        )
+
+    archive = PageArchive(args.archive) if args.archive else None
+    cache = PageCache(args.cache_dir) if args.cache_dir and not args.replay else None
+    memo = SelectorMemo(args.selector_memo) if args.selector_memo else None
+    checkpoint = CheckpointStore(args.checkpoint_dir) if args.checkpoint_dir else None
+    throttle = AdaptiveThrottle(initial_rate=args.request_rate) if args.request_rate else None
+    seen_index = (
+        FingerprintIndex(args.seen_index, max_age_days=args.seen_max_age_days, bloom=True)
+        if args.seen_index else None
+    )
+    profiler = StageProfiler(args.profile_dir)
+    if profiler.enabled:
+        # cProfile hanya melihat thread pemanggil: extract dijalankan tanpa
+        # thread pool dan mode streaming (thread extract terpisah) dimatikan.
+        args.workers = 1
+        args.parse_workers = 0
+        args.streaming = False
+
+    extract_kwargs = dict(
+        max_workers=args.workers,
+        cache=cache,
+        parser=args.parser,
+        memo=memo,
+        checkpoint=checkpoint,
+        resume=args.resume,
+        throttle=throttle,
+        parse_workers=args.parse_workers,
+        base_url=args.base_url,
+        archive=archive,
+        replay=args.replay,
+        replay_as_of=args.replay_as_of,
+    )
+
+    def export_metrics(status):
+        if args.metrics_json:
+            REGISTRY.write_json(args.metrics_json, status=status, streaming=args.streaming, sinks=sinks)
+        if args.metrics_prom:
+            REGISTRY.write_prometheus(args.metrics_prom)
+
+    # Hasil kosong hanya dianggap sukses bila seen_index memang membuang
+    # produk yang sudah dimuat; extract yang gagal total tetap error.
+    seen_before = _already_seen_rows()
+
+    if args.streaming:
+        try:
+            total = run_streaming(
+                build_writers(sinks, options),
+                pages=args.pages,
+                engine=args.engine,
+                seen_index=seen_index,
+                **extract_kwargs,
+            )
+        except Exception:
+            export_metrics("failed")
+            raise
+        if total == 0 and _already_seen_rows() == seen_before:
+            export_metrics("failed")
+            print("Proses ETL gagal: tidak ada data yang dimuat.")
+            return 1
+    else:
+        with profiler.stage("extract"):
+            raw_data = extract_all(args.pages, as_columns=True, **extract_kwargs)
+        with profiler.stage("transform"):
+            clean_df = transform(raw_data, engine=args.engine, seen_index=seen_index)
+
+        results = run_sinks(
+            clean_df, build_sinks(sinks, options), profiler=profiler,
+            skip_empty=_already_seen_rows() > seen_before,
+        )
+        failed = [name for name, r in results.items() if not r.ok]
+        if seen_index is not None:
+            if failed:
+                seen_index.rollback()
+            else:
+                seen_index.commit()
+        if failed:
+            export_metrics("failed")
+            print(f"Proses ETL selesai dengan error pada: {', '.join(failed)}")
+            return 1
+
+    export_metrics("ok")
+    print("Proses ETL selesai dengan sukses!")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,114 @@
+import gzip
+import json
+import os
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from utils.archive import PageArchive, parse_as_of
+
+
+def test_page_archive_roundtrip_and_reopen(tmp_path):
+    path = str(tmp_path / "archive" / "pages.jsonl.gz")
+    archive = PageArchive(path)
+    archive.append("https://example.local/", "<html>1</html>", {"ETag": '"a"'}, 200, "2025-08-19T10:00:00")
+    archive.append("https://example.local/page2", "<html>2</html>", timestamp="2025-08-19T10:00:01")
+
+    reopened = PageArchive(path)
+    record = reopened.get("https://example.local/")
+    assert record["body"] == "<html>1</html>"
+    assert record["headers"] == {"ETag": '"a"'}
+    assert record["timestamp"] == "2025-08-19T10:00:00"
+    assert len(reopened) == 2 and "https://example.local/page2" in reopened
+    assert reopened.get("https://example.local/none") is None
+
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        assert [json.loads(line)["url"] for line in f] == [
+            "https://example.local/",
+            "https://example.local/page2",
+        ]
+
+
+def test_page_archive_keeps_latest_version_per_url(tmp_path):
+    archive = PageArchive(str(tmp_path / "pages.jsonl.gz"))
+    archive.append("https://example.local/", "lama")
+    archive.append("https://example.local/", "baru")
+
+    assert archive.get("https://example.local/")["body"] == "baru"
+    assert len(archive) == 1
+    assert [r["body"] for r in archive] == ["lama", "baru"]
+
+
+def test_page_archive_rebuilds_missing_index(tmp_path):
+    path = str(tmp_path / "pages.jsonl.gz")
+    archive = PageArchive(path)
+    archive.append("https://example.local/", "<html>1</html>")
+    archive.append("https://example.local/page2", "<html>2</html>")
+    os.remove(archive.index_path)
+
+    rebuilt = PageArchive(path)
+    assert len(rebuilt) == 2
+    assert rebuilt.get("https://example.local/page2")["body"] == "<html>2</html>"
+    assert os.path.exists(rebuilt.index_path)
+
+
+def test_page_archive_ignores_truncated_tail(tmp_path):
+    path = str(tmp_path / "pages.jsonl.gz")
+    archive = PageArchive(path)
+    archive.append("https://example.local/", "<html>1</html>")
+    with open(path, "ab") as f:
+        f.write(gzip.compress(b'{"url": "https://example.local/page2"}')[:10])
+
+    recovered = PageArchive(path)
+    assert len(recovered) == 1
+    assert recovered.get("https://example.local/")["body"] == "<html>1</html>"
+
+
+def test_page_archive_scan_handles_members_across_read_chunks(tmp_path, mocker):
+    path = str(tmp_path / "pages.jsonl.gz")
+    archive = PageArchive(path)
+    for i in range(20):
+        archive.append(f"https://example.local/page{i}", f"<html>{i}</html>" * (i + 1))
+    expected = dict(archive._index)
+    os.remove(archive.index_path)
+
+    mocker.patch("utils.archive._SCAN_CHUNK", 7)
+    rebuilt = PageArchive(path)
+
+    assert rebuilt._index == expected
+    assert [r["body"] for r in rebuilt][-1] == "<html>19</html>" * 20
+
+
+def test_page_archive_selects_version_as_of_timestamp(tmp_path):
+    path = str(tmp_path / "pages.jsonl.gz")
+    archive = PageArchive(path)
+    archive.append("https://example.local/", "senin", timestamp="2025-08-18T09:00:00")
+    archive.append("https://example.local/", "selasa", timestamp="2025-08-19T09:00:00.250000")
+    os.remove(archive.index_path)
+    archive = PageArchive(path)
+
+    assert archive.get("https://example.local/")["body"] == "selasa"
+    assert archive.get("https://example.local/", as_of="2025-08-19")["body"] == "senin"
+    assert archive.get("https://example.local/", as_of="2025-08-19T09:00:00.250000")["body"] == "selasa"
+    assert archive.get("https://example.local/", as_of="2025-08-01") is None
+    assert archive.timestamps("https://example.local/") == ["2025-08-18T09:00:00", "2025-08-19T09:00:00.250000"]
+
+
+def test_parse_as_of_normalizes_timezone_to_naive_local_time():
+    aware = datetime(2025, 8, 21, tzinfo=timezone(timedelta(hours=7)))
+
+    assert parse_as_of("2025-08-21") == datetime(2025, 8, 21)
+    assert parse_as_of("2025-08-21T00:00+07:00") == aware.astimezone().replace(tzinfo=None)
+    assert parse_as_of(aware).tzinfo is None
+    with pytest.raises(ValueError):
+        parse_as_of("kemarin")
+
+
+def test_page_archive_get_accepts_timezone_aware_cutoff(tmp_path):
+    archive = PageArchive(str(tmp_path / "pages.jsonl.gz"))
+    fetched = datetime(2025, 8, 19, 9, 0)
+    archive.append("https://example.local/", "senin", timestamp=fetched.isoformat())
+    local_cutoff = (fetched + timedelta(minutes=1)).astimezone()
+
+    assert archive.get("https://example.local/", as_of=local_cutoff.isoformat())["body"] == "senin"
+    assert archive.get("https://example.local/", as_of=(local_cutoff - timedelta(minutes=2)).isoformat()) is None
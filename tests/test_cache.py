@@ -0,0 +1,36 @@
+from utils.cache import PageCache, SelectorMemo
+
+
+def test_page_cache_roundtrip(tmp_path):
+    cache = PageCache(str(tmp_path))
+    cache.put("https://example.local/", "<html></html>", etag='"abc"', last_modified="Tue, 19 Aug 2025 10:00:00 GMT",
+              rows=[{"Title": "Jacket"}])
+
+    entry = cache.get("https://example.local/")
+    assert entry["body"] == "<html></html>"
+    assert entry["rows"] == [{"Title": "Jacket"}]
+    assert PageCache.conditional_headers(entry) == {
+        "If-None-Match": '"abc"',
+        "If-Modified-Since": "Tue, 19 Aug 2025 10:00:00 GMT",
+    }
+
+
+def test_page_cache_missing_and_corrupt_entry(tmp_path):
+    cache = PageCache(str(tmp_path))
+    assert cache.get("https://example.local/none") is None
+
+    with open(cache._path("https://example.local/bad"), "w") as f:
+        f.write("{not json")
+    assert cache.get("https://example.local/bad") is None
+    assert PageCache.conditional_headers(None) == {}
+
+
+def test_selector_memo_persists_between_instances(tmp_path):
+    path = str(tmp_path / "memo" / "selectors.json")
+    memo = SelectorMemo(path)
+    memo.set("https://example.local", "div.product-details")
+
+    assert SelectorMemo(path).get("https://example.local") == "div.product-details"
+
+    memo.forget("https://example.local")
+    assert SelectorMemo(path).get("https://example.local") is None
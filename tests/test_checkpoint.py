@@ -0,0 +1,40 @@
+from utils.checkpoint import CheckpointStore
+
+
+def test_checkpoint_tracks_completed_and_failed_pages(tmp_path):
+    store = CheckpointStore(str(tmp_path))
+    store.save_page(1, [{"Title": "Jacket"}])
+    store.mark_failed(2)
+    store.mark_failed(3)
+    store.save_page(3, [])
+
+    reopened = CheckpointStore(str(tmp_path))
+    assert reopened.completed_pages() == {1, 3}
+    assert reopened.failed_pages() == {2}
+    assert reopened.load_page(1) == [{"Title": "Jacket"}]
+    assert reopened.load_page(2) is None
+
+
+def test_checkpoint_clear(tmp_path):
+    store = CheckpointStore(str(tmp_path / "run"))
+    store.save_page(1, [{"Title": "Jacket"}])
+    store.mark_failed(2)
+
+    store.clear()
+
+    assert store.completed_pages() == set()
+    assert store.failed_pages() == set()
+
+
+def test_checkpoint_clear_keeps_unrelated_files(tmp_path):
+    (tmp_path / "products.csv").write_text("Title\nJacket\n")
+    (tmp_path / "notes").mkdir()
+    (tmp_path / "page-notes.json").write_text("{}")
+    store = CheckpointStore(str(tmp_path))
+    store.save_page(1, [{"Title": "Jacket"}])
+    store.mark_failed(2)
+    (tmp_path / "page-00003.json.tmp-123-456").write_text("[")
+
+    store.clear()
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["notes", "page-notes.json", "products.csv"]
@@ -1,6 +1,17 @@
+import re
 import pytest
 import requests
-from utils.extract import extract_all, _fetch_html, scrape_page
+from bs4 import BeautifulSoup
+from benchmarks.pages import render_page
+from benchmarks.server import ServerConfig, SyntheticServer
+import utils.extract as extract_module
+from utils.archive import PageArchive
+from utils.cache import PageCache, SelectorMemo
+from utils.checkpoint import CheckpointStore
+from utils.throttle import AdaptiveThrottle
+from utils.extract import extract_all, _fetch_html, scrape_page, _requests_session, _resolve_parser, PARSERS
+from utils.extract import _find_cards, _extract_with_patterns, _parse_products, BASE_URL, PRODUCT_FIELDS
+from utils.extract import create_parse_pool
 
 def test_extract_all_structure(requests_mock):
     """Tes struktur dasar output dari extract_all."""
@@ -126,4 +137,291 @@ def test_scrape_page_creates_own_session(requests_mock):
     data = scrape_page(page=1, session=None)
     
     assert len(data) == 1
-    assert data[0].Title == "P1"
\ No newline at end of file
+    assert data[0].Title == "P1"
+
+def test_extract_all_concurrent_keeps_page_order(requests_mock):
+    """Mode konkuren tetap mengembalikan produk sesuai urutan halaman dan melewati halaman gagal."""
+    TOTAL_TEST_PAGES = 20
+    failed_pages = {3, 17}
+
+    for page_num in range(1, TOTAL_TEST_PAGES + 1):
+        url = "https://fashion-studio.dicoding.dev/" if page_num == 1 else f"https://fashion-studio.dicoding.dev/page{page_num}"
+        if page_num in failed_pages:
+            requests_mock.get(url, status_code=503)
+        else:
+            mock_html = f'<html><body><div class="product-card"><h3 class="product-title">Produk Hal {page_num}</h3><span class="product-price">${page_num}</span></div></body></html>'
+            requests_mock.get(url, text=mock_html)
+
+    data = extract_all(pages=TOTAL_TEST_PAGES, max_workers=4)
+
+    expected = [f"Produk Hal {p}" for p in range(1, TOTAL_TEST_PAGES + 1) if p not in failed_pages]
+    assert [item["Title"] for item in data] == expected
+
+
+def test_requests_session_pool_size():
+    """Pool koneksi per host mengikuti jumlah worker."""
+    session = _requests_session(pool_size=12)
+    assert session.get_adapter("https://fashion-studio.dicoding.dev/")._pool_maxsize == 12
+
+
+def test_scrape_page_reuses_cached_rows_on_304(requests_mock, tmp_path, mocker):
+    """Halaman yang tidak berubah (304) memakai ulang hasil ekstraksi tanpa parsing."""
+    url = "https://fashion-studio.dicoding.dev/"
+    mock_html = '<html><body><div class="product-card"><h3 class="product-title">Cached Jacket</h3><span class="product-price">$10</span></div></body></html>'
+    cache = PageCache(str(tmp_path))
+
+    requests_mock.get(url, text=mock_html, headers={"ETag": '"v1"'})
+    first = scrape_page(page=1, cache=cache)
+
+    requests_mock.get(url, status_code=304)
+    parse_spy = mocker.patch("utils.extract._find_cards")
+    second = scrape_page(page=1, cache=cache)
+
+    assert requests_mock.last_request.headers["If-None-Match"] == '"v1"'
+    parse_spy.assert_not_called()
+    assert [p.Title for p in second] == [p.Title for p in first] == ["Cached Jacket"]
+
+
+@pytest.mark.parametrize("parser", [p for p in PARSERS if _resolve_parser(p) == p])
+def test_scrape_page_parsers_give_identical_results(requests_mock, parser):
+    """Semua backend parser menghasilkan produk yang sama dengan html.parser."""
+    mock_html = """
+    <html><body>
+        <div class="product-card"><h3 class="product-title">Good Product</h3><span class="product-price">$99.99</span>
+            <p>4.5 / 5</p><p>3 Colors</p><p>Size: M</p><p>Gender: Men</p></div>
+        <div class="product-card"><span class="product-price">$50.00</span></div>
+        <div class="product-card"><h3>Plain Heading</h3><span>$10</span><p class="product-rating">4.0</p></div>
+    </body></html>
+    """
+    requests_mock.get("https://fashion-studio.dicoding.dev/", text=mock_html)
+
+    expected = [{k: v for k, v in p.to_row().items() if k != "Timestamp"} for p in scrape_page(page=1, parser="html.parser")]
+    actual = [{k: v for k, v in p.to_row().items() if k != "Timestamp"} for p in scrape_page(page=1, parser=parser)]
+
+    assert actual == expected
+    assert len(actual) == 2
+
+
+def test_resolve_parser_rejects_unknown_backend():
+    with pytest.raises(ValueError):
+        _resolve_parser("regex")
+
+
+REAL_LAYOUT_HTML = """
+<html><body><div class="container"><div id="collectionList" class="collection-grid">
+    <div class="collection-card"><div class="product-details">
+        <h3 class="product-title">T-shirt 1</h3>
+        <div class="price-container"><span class="price">$102.15</span></div>
+        <p style="font-size: 14px;">Rating: ⭐ 3.9 / 5</p><p style="font-size: 14px;">3 Colors</p>
+        <p style="font-size: 14px;">Size: M</p><p style="font-size: 14px;">Gender: Women</p>
+    </div></div>
+    <div class="collection-card"><div class="product-details">
+        <h3 class="product-title">Hoodie 2</h3>
+        <div class="price-container"><span class="price">$496.88</span></div>
+        <p style="font-size: 14px;">Rating: ⭐ 4.8 / 5</p><p style="font-size: 14px;">3 Colors</p>
+        <p style="font-size: 14px;">Size: L</p><p style="font-size: 14px;">Gender: Unisex</p>
+    </div></div>
+</div></div></body></html>
+"""
+
+
+def test_find_cards_learns_selector_from_full_scan(tmp_path, mocker):
+    """Selector hasil scan penuh disimpan dan dipakai langsung pada halaman berikutnya."""
+    memo = SelectorMemo(str(tmp_path / "selectors.json"))
+    soup = BeautifulSoup(REAL_LAYOUT_HTML, "html.parser")
+
+    cards = _find_cards(soup, memo)
+    assert memo.get(BASE_URL) == "div.product-details"
+    assert [_extract_with_patterns(c)["Title"] for c in cards] == ["T-shirt 1", "Hoodie 2"]
+
+    scan_spy = mocker.spy(extract_module, "_scan_cards")
+    reloaded = SelectorMemo(str(tmp_path / "selectors.json"))
+    cards_again = _find_cards(BeautifulSoup(REAL_LAYOUT_HTML, "html.parser"), reloaded)
+    scan_spy.assert_not_called()
+    assert len(cards_again) == 2
+
+
+def test_find_cards_forgets_stale_selector(tmp_path):
+    """Selector yang sudah tidak cocok dilupakan dan diganti hasil pencarian baru."""
+    memo = SelectorMemo(str(tmp_path / "selectors.json"))
+    memo.set(BASE_URL, "div.old-layout")
+    soup = BeautifulSoup('<div class="product-card"><h3>P1</h3><span>$10</span></div>', "html.parser")
+
+    cards = _find_cards(soup, memo)
+
+    assert len(cards) == 1
+    assert memo.get(BASE_URL) == ".product-card"
+
+
+def _reference_extract(container):
+    """Implementasi lama (pencarian per field) sebagai pembanding."""
+    def text(el):
+        return el.get_text(strip=True) if el else ""
+    return {
+        "Title": text(container.select_one(".product-title")) or text(container.find(["h2", "h3", "h4"])),
+        "Price": text(container.select_one(".product-price")) or text(container.find(string=re.compile(r"\$\s*\d"))),
+        "Rating": text(container.select_one(".product-rating"))
+        or text(container.find(string=re.compile(r"\d+(\.\d+)?\s*/\s*5")))
+        or text(container.find(string=re.compile(r"^\d+(\.\d+)?$"))),
+        "Colors": text(container.select_one(".product-colors")) or text(container.find(string=re.compile(r"Colors?", re.I))),
+        "Size": text(container.select_one(".product-size")) or text(container.find(string=re.compile(r"Size", re.I))),
+        "Gender": text(container.select_one(".product-gender")) or text(container.find(string=re.compile(r"Gender", re.I))),
+    }
+
+
+@pytest.mark.parametrize("html", [
+    REAL_LAYOUT_HTML,
+    render_page(1, products=30) + render_page(2, products=30),
+    """<div class="card"><h4>Heading</h4><h3 class="product-title"> </h3><p>$ 12</p><p>5</p>
+       <span class="product-size">Size: XL</span><p>Size: S</p><p>colors: 2</p><p>GENDER: Men</p></div>""",
+])
+def test_single_pass_extractor_matches_reference(html):
+    """Extractor satu pass menghasilkan field yang sama persis dengan pencarian per field."""
+    soup = BeautifulSoup(html, "html.parser")
+    containers = soup.find_all(["div", "article", "li"])
+    assert containers
+    for c in containers:
+        assert _extract_with_patterns(c) == _reference_extract(c)
+
+
+def test_extract_all_resumes_from_checkpoint(requests_mock, tmp_path):
+    """Resume hanya mengambil ulang halaman yang gagal; halaman lain dibaca dari checkpoint."""
+    checkpoint = CheckpointStore(str(tmp_path))
+    urls = {p: ("https://fashion-studio.dicoding.dev/" if p == 1 else f"https://fashion-studio.dicoding.dev/page{p}") for p in range(1, 5)}
+    for p, url in urls.items():
+        if p == 3:
+            requests_mock.get(url, status_code=503)
+        else:
+            requests_mock.get(url, text=f'<html><body><div class="product-card"><h3 class="product-title">Produk Hal {p}</h3><span class="product-price">${p}</span></div></body></html>')
+
+    first = extract_all(pages=4, checkpoint=checkpoint)
+    assert [i["Title"] for i in first] == ["Produk Hal 1", "Produk Hal 2", "Produk Hal 4"]
+    assert checkpoint.failed_pages() == {3}
+
+    requests_mock.reset_mock()
+    requests_mock.get(urls[3], text='<html><body><div class="product-card"><h3 class="product-title">Produk Hal 3</h3><span class="product-price">$3</span></div></body></html>')
+    resumed = extract_all(pages=4, checkpoint=checkpoint, resume=True)
+
+    assert [i["Title"] for i in resumed] == [f"Produk Hal {p}" for p in range(1, 5)]
+    assert [r.url for r in requests_mock.request_history] == [urls[3]]
+    assert checkpoint.failed_pages() == set()
+
+
+def test_scrape_page_throttle_retries_after_429(requests_mock):
+    url = f"{BASE_URL}/page2"
+    requests_mock.get(url, [
+        {"status_code": 429, "headers": {"Retry-After": "0"}},
+        {"text": render_page(2, products=3)},
+    ])
+    sleeps = []
+    throttle = AdaptiveThrottle(initial_rate=100.0, sleep=sleeps.append)
+
+    rows = scrape_page(2, session=_requests_session(retry_statuses=False), throttle=throttle)
+
+    assert rows
+    assert requests_mock.call_count == 2
+    assert throttle.rate < 100.0
+
+
+def test_extract_all_against_synthetic_server():
+    config = ServerConfig(pages=3, products=5)
+    with SyntheticServer(config) as server:
+        rows = extract_all(pages=3, max_workers=3, base_url=server.base_url)
+
+    titles = [r["Title"] for r in rows]
+    assert len(rows) >= 12
+    assert titles == sorted(titles, key=lambda t: int(t.split()[-1]))
+
+
+def test_extract_all_as_columns_matches_rows(requests_mock):
+    for page in (1, 2):
+        url = BASE_URL + "/" if page == 1 else f"{BASE_URL}/page{page}"
+        requests_mock.get(url, text=render_page(page, products=4))
+
+    rows = extract_all(pages=2)
+    columns = extract_all(pages=2, as_columns=True)
+
+    assert len(columns) == len(rows)
+    frame = columns.to_frame()
+    assert list(frame.columns) == list(PRODUCT_FIELDS)
+    assert frame.drop(columns="Timestamp").to_dict("records") == [
+        {k: v for k, v in r.items() if k != "Timestamp"} for r in rows
+    ]
+
+
+def test_parse_products_returns_records_and_learned_selector():
+    html = render_page(1, products=4)
+
+    records, learned = _parse_products(html, "html.parser")
+    again, kept = _parse_products(html, "html.parser", selector_hint=learned)
+
+    assert learned == "div.product-details"
+    assert again == records and kept == learned
+    assert all(len(r) == len(PRODUCT_FIELDS) - 1 for r in records)
+
+
+def test_extract_all_with_parse_process_pool_matches_threads(requests_mock, tmp_path):
+    for page in (1, 2, 3):
+        url = BASE_URL + "/" if page == 1 else f"{BASE_URL}/page{page}"
+        requests_mock.get(url, text=render_page(page, products=6))
+    memo = SelectorMemo(str(tmp_path / "selectors.json"))
+
+    threaded = extract_all(pages=3, max_workers=3)
+    pooled = extract_all(pages=3, max_workers=3, parse_workers=2, memo=memo)
+
+    strip = lambda rows: [{k: v for k, v in r.items() if k != "Timestamp"} for r in rows]
+    assert strip(pooled) == strip(threaded)
+    assert memo.get(BASE_URL)
+
+
+def test_create_parse_pool_does_not_fork():
+    assert create_parse_pool(0) is None
+    pool = create_parse_pool(1)
+    try:
+        assert pool._mp_context.get_start_method() in ("forkserver", "spawn")
+    finally:
+        pool.shutdown()
+
+
+def test_extract_all_replays_pages_from_archive(requests_mock, tmp_path):
+    for page in (1, 2):
+        url = BASE_URL + "/" if page == 1 else f"{BASE_URL}/page{page}"
+        requests_mock.get(url, text=render_page(page, products=4))
+    archive = PageArchive(str(tmp_path / "pages.jsonl.gz"))
+
+    live = extract_all(pages=2, archive=archive)
+    requests_mock.reset_mock()
+    replayed = extract_all(pages=2, max_workers=2, archive=PageArchive(archive.path), replay=True)
+
+    assert replayed == live
+    assert requests_mock.call_count == 0
+
+
+def test_extract_all_replays_older_scrape_as_of(requests_mock, tmp_path):
+    requests_mock.get(BASE_URL + "/", text=render_page(1, products=4))
+    archive = PageArchive(str(tmp_path / "pages.jsonl.gz"))
+    old = extract_all(pages=1, archive=archive)
+    cutoff = archive.timestamps(BASE_URL + "/")[-1]
+    requests_mock.get(BASE_URL + "/", text=render_page(2, products=3))
+    new = extract_all(pages=1, archive=archive)
+
+    assert extract_all(pages=1, archive=archive, replay=True) == new
+    assert extract_all(pages=1, archive=archive, replay=True, replay_as_of=cutoff) == old
+
+
+def test_extract_all_rejects_invalid_replay_as_of(tmp_path):
+    archive = PageArchive(str(tmp_path / "pages.jsonl.gz"))
+    with pytest.raises(ValueError):
+        extract_all(pages=1, archive=archive, replay=True, replay_as_of="kemarin")
+
+
+def test_scrape_page_replay_missing_page_raises(tmp_path):
+    archive = PageArchive(str(tmp_path / "pages.jsonl.gz"))
+    with pytest.raises(LookupError):
+        scrape_page(3, archive=archive, replay=True)
+
+
+def test_product_raw_is_slotted():
+    product = extract_module.ProductRaw(*PRODUCT_FIELDS)
+    assert not hasattr(product, "__dict__")
+    assert product.to_row() == {name: name for name in PRODUCT_FIELDS}
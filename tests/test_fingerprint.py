@@ -0,0 +1,74 @@
+import numpy as np
+
+from utils.fingerprint import BloomFilter, FingerprintIndex
+from utils.transform import transform
+
+
+def _rows(price="$10.00"):
+    return [
+        {"Title": "Jacket", "Price": price, "Rating": "4.5 / 5", "Colors": "3 Colors", "Size": "Size: M", "Gender": "Gender: Men", "Timestamp": "2025-08-19T10:00:00"},
+        {"Title": "Shirt", "Price": "$20.00", "Rating": "4.0 / 5", "Colors": "2 Colors", "Size": "Size: L", "Gender": "Gender: Women", "Timestamp": "2025-08-19T10:00:00"},
+    ]
+
+
+def test_index_commits_pending_and_persists(tmp_path):
+    path = str(tmp_path / "fp.sqlite")
+    fps = np.array([1, 2**63 + 5, 2**64 - 1], dtype=np.uint64)
+
+    index = FingerprintIndex(path)
+    index.add(fps)
+    assert not index.contains(fps).any()
+    assert index.commit() == 3
+    index.close()
+
+    reopened = FingerprintIndex(path, bloom=True)
+    assert reopened.contains(np.array([2**64 - 1, 7], dtype=np.uint64)).tolist() == [True, False]
+    assert len(reopened) == 3
+
+
+def test_index_rollback_and_expiry(tmp_path):
+    now = [1_000_000.0]
+    index = FingerprintIndex(str(tmp_path / "fp.sqlite"), max_age_days=1, clock=lambda: now[0])
+    index.add(np.array([1], dtype=np.uint64))
+    index.rollback()
+    assert index.commit() == 0
+
+    index.add(np.array([2], dtype=np.uint64))
+    index.commit()
+    now[0] += 2 * 86400
+    assert index.expire() == 1
+    assert len(index) == 0
+
+
+def test_transform_skips_products_seen_in_previous_runs(tmp_path):
+    index = FingerprintIndex(str(tmp_path / "fp.sqlite"), bloom=True)
+
+    first = transform(_rows(), seen_index=index)
+    index.commit()
+    second = transform(_rows(price="$12.00"), seen_index=index)
+
+    assert len(first) == 2
+    assert second["Title"].tolist() == ["Jacket"]
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(bits=1 << 12)
+    fps = np.random.default_rng(0).integers(0, 2**63, size=200, dtype=np.int64).astype(np.uint64)
+    bloom.add(fps)
+    assert bloom.might_contain(fps).all()
+
+
+def test_index_loads_bloom_filter_in_chunks(tmp_path, mocker):
+    path = str(tmp_path / "fp.sqlite")
+    fps = np.random.default_rng(1).integers(0, 2**63, size=25, dtype=np.int64).astype(np.uint64)
+    index = FingerprintIndex(path)
+    index.add(fps)
+    index.commit()
+    index.close()
+
+    mocker.patch("utils.fingerprint._BLOOM_LOAD_BATCH", 10)
+    add = mocker.spy(BloomFilter, "add")
+    reopened = FingerprintIndex(path, bloom=True)
+
+    assert [len(c.args[1]) for c in add.call_args_list] == [10, 10, 5]
+    assert reopened.contains(fps).all()
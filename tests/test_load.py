@@ -2,7 +2,9 @@ import os
 import pandas as pd
 import pytest
 import gspread
-from utils.load import load_to_csv, load_to_gsheets, load_to_postgres
+import psycopg2
+from utils.load import load_to_csv, load_to_gsheets, load_to_postgres, CsvStreamWriter, PostgresStreamWriter
+from utils.load import load_to_parquet, read_parquet_snapshots
 
 @pytest.fixture
 def sample_df():
@@ -27,15 +29,62 @@ def test_load_to_gsheets_success(sample_df, mocker):
     mock_client = mocker.Mock()
     mocker.patch("gspread.authorize", return_value=mock_client)
     mocker.patch("oauth2client.service_account.ServiceAccountCredentials.from_json_keyfile_name")
+    sheet = mock_client.open_by_key.return_value.sheet1
+    sheet.get_all_values.return_value = []
     
     load_to_gsheets(sample_df, spreadsheet_id="test_id")
     
     mock_client.open_by_key.assert_called_once_with("test_id")
-    update_call_args = mock_client.open_by_key.return_value.sheet1.update.call_args[0][0]
+    (payload,) = sheet.batch_update.call_args[0]
+    assert payload[0]["range"] == "A1:G2"
+    update_call_args = payload[0]["values"]
+    assert update_call_args[0] == list(sample_df.columns)
     assert isinstance(update_call_args[1][-1], str)
     assert "2025-08-14T12:00:00" in update_call_args[1][-1]
 
 
+def test_load_to_gsheets_writes_only_changed_rows(sample_df, mocker):
+    mock_client = mocker.Mock()
+    mocker.patch("gspread.authorize", return_value=mock_client)
+    mocker.patch("oauth2client.service_account.ServiceAccountCredentials.from_json_keyfile_name")
+    sheet = mock_client.open_by_key.return_value.sheet1
+    df = pd.concat([sample_df, sample_df.assign(Title="Shirt"), sample_df.assign(Title="Hat")], ignore_index=True)
+    ts = "2025-08-14T12:00:00.000000"
+    sheet.get_all_values.return_value = [
+        list(df.columns),
+        ["Jacket", 160000, 4.8, 3, "M", "Men", ts],
+        ["Shirt", 99000, 4.8, 3, "M", "Men", ts],
+        ["Hat", 160000, 4.8, 3, "M", "Men", ts],
+        ["Old", 1, 1, 1, "S", "Women", ts],
+    ]
+
+    load_to_gsheets(df, spreadsheet_id="test_id")
+
+    sheet.clear.assert_not_called()
+    (payload,) = sheet.batch_update.call_args[0]
+    assert [p["range"] for p in payload] == ["A3:G3", "A5:G5"]
+    assert payload[0]["values"][0][:2] == ["Shirt", 160000.0]
+    assert payload[1]["values"] == [[""] * 7]
+
+
+def test_load_to_gsheets_chunks_large_updates(sample_df, mocker):
+    mock_client = mocker.Mock()
+    mocker.patch("gspread.authorize", return_value=mock_client)
+    mocker.patch("oauth2client.service_account.ServiceAccountCredentials.from_json_keyfile_name")
+    sleep = mocker.patch("utils.load.time.sleep")
+    sheet = mock_client.open_by_key.return_value.sheet1
+    sheet.get_all_values.return_value = []
+    df = pd.concat([sample_df.assign(Title=f"P{i}") for i in range(10)], ignore_index=True)
+
+    load_to_gsheets(df, spreadsheet_id="test_id", max_cells=28, interval=0.5)
+
+    payloads = [c[0][0] for c in sheet.batch_update.call_args_list]
+    assert len(payloads) == 3
+    assert sum(len(r["values"]) for p in payloads for r in p) == 11
+    assert all(len(r["values"]) * 7 <= 28 for p in payloads for r in p)
+    assert sleep.call_count == 2
+
+
 def test_load_to_gsheets_empty_df():
     with pytest.raises(ValueError):
         load_to_gsheets(pd.DataFrame(), "any")
@@ -53,18 +102,68 @@ def test_load_to_postgres_success(sample_df, mocker):
     mock_connect = mocker.patch("psycopg2.connect")
     mock_cursor = mock_connect.return_value.cursor.return_value
     db_config = {"host": "localhost"}
-    
+    copied = []
+    mock_cursor.copy_expert.side_effect = lambda sql, buf: copied.append((sql, buf.read()))
+
     load_to_postgres(sample_df, db_config)
 
     mock_connect.assert_called_once_with(**db_config)
     mock_connect.return_value.commit.assert_called_once()
 
-    insert_call_args = mock_cursor.execute.call_args_list[1]
-    inserted_data_tuple = insert_call_args[0][1]
+    assert len(copied) == 1
+    copy_sql, copy_data = copied[0]
+    assert copy_sql.startswith("COPY etl_data (Title, Price, Rating, Colors, Size, Gender, Timestamp) FROM STDIN")
+    assert copy_data == "Jacket,160000.0,4.8,3,M,Men,2025-08-14 12:00:00.000000\n"
+
+
+def test_load_to_postgres_copy_keeps_empty_strings(sample_df, mocker):
+    mock_connect = mocker.patch("psycopg2.connect")
+    mock_cursor = mock_connect.return_value.cursor.return_value
+    copied = []
+    mock_cursor.copy_expert.side_effect = lambda sql, buf: copied.append((sql, buf.read()))
+
+    load_to_postgres(sample_df.assign(Size="", Gender=""), {})
+
+    (copy_sql, copy_data), = copied
+    assert copy_sql.endswith("WITH (FORMAT csv, FORCE_NOT_NULL (Title, Size, Gender))")
+    assert copy_data == "Jacket,160000.0,4.8,3,,,2025-08-14 12:00:00.000000\n"
+
+
+def test_load_to_postgres_copy_in_batches(sample_df, mocker):
+    mock_connect = mocker.patch("psycopg2.connect")
+    mock_cursor = mock_connect.return_value.cursor.return_value
+    df = pd.concat([sample_df] * 5, ignore_index=True)
+
+    load_to_postgres(df, {}, batch_size=2)
+
+    assert mock_cursor.copy_expert.call_count == 3
+    mock_connect.return_value.commit.assert_called_once()
+
+
+def test_load_to_postgres_values_method(sample_df, mocker):
+    mocker.patch("psycopg2.connect")
+    mock_execute_values = mocker.patch("utils.load.execute_values")
+
+    load_to_postgres(sample_df, {}, method="values")
+
+    records = mock_execute_values.call_args[0][2]
+    assert isinstance(records[0][1], float)
+    assert isinstance(records[0][-1], pd.Timestamp)
+    assert records[0][-1] == pd.Timestamp("2025-08-14T12:00:00")
 
-    assert isinstance(inserted_data_tuple[1], float)
-    assert isinstance(inserted_data_tuple[-1], pd.Timestamp)
-    assert inserted_data_tuple[-1] == pd.Timestamp("2025-08-14T12:00:00")
+
+def test_load_to_postgres_falls_back_when_copy_unsupported(sample_df, mocker):
+    mock_connect = mocker.patch("psycopg2.connect")
+    mock_cursor = mock_connect.return_value.cursor.return_value
+    mock_cursor.copy_expert.side_effect = psycopg2.NotSupportedError("COPY not supported")
+    mock_execute_values = mocker.patch("utils.load.execute_values")
+
+    load_to_postgres(sample_df, {})
+
+    mock_execute_values.assert_called_once()
+    executed = [c[0][0] for c in mock_cursor.execute.call_args_list]
+    assert "ROLLBACK TO SAVEPOINT bulk_load" in executed
+    mock_connect.return_value.commit.assert_called_once()
 
 
 def test_load_to_postgres_empty_df():
@@ -75,4 +174,202 @@ def test_load_to_postgres_connection_error(sample_df, mocker):
     mocker.patch("psycopg2.connect", side_effect=Exception("Connection Failed"))
     
     with pytest.raises(Exception, match="Connection Failed"):
-        load_to_postgres(sample_df, {})
\ No newline at end of file
+        load_to_postgres(sample_df, {})
+
+def test_csv_stream_writer_writes_header_once(sample_df, tmp_path):
+    writer = CsvStreamWriter("stream.csv", tmp_path)
+    writer.write(sample_df)
+    writer.write(sample_df.assign(Title="Shirt"))
+    writer.close()
+
+    result = pd.read_csv(writer.path)
+    assert result["Title"].tolist() == ["Jacket", "Shirt"]
+    assert writer.rows == 2
+
+
+def test_postgres_stream_writer_commits_each_chunk(sample_df, mocker):
+    mock_connect = mocker.patch("psycopg2.connect")
+    writer = PostgresStreamWriter({"host": "localhost"})
+
+    writer.write(sample_df)
+    writer.write(sample_df)
+    writer.close()
+
+    mock_connect.assert_called_once_with(host="localhost")
+    assert mock_connect.return_value.commit.call_count == 2
+    mock_connect.return_value.close.assert_called_once()
+
+
+def test_load_to_postgres_upsert_merges_through_staging(sample_df, mocker):
+    mock_connect = mocker.patch("psycopg2.connect")
+    mock_cursor = mock_connect.return_value.cursor.return_value
+    mock_cursor.rowcount = 1
+    mock_cursor.fetchone.return_value = (False,)
+
+    load_to_postgres(sample_df, {}, mode="upsert")
+
+    executed = [" ".join(c[0][0].split()) for c in mock_cursor.execute.call_args_list]
+    assert any(q.startswith("CREATE TEMP TABLE etl_data_staging") for q in executed)
+    assert any("CREATE UNIQUE INDEX IF NOT EXISTS etl_data_fingerprint_key" in q for q in executed)
+    merge = next(q for q in executed if q.startswith("INSERT INTO etl_data"))
+    assert "FROM etl_data_staging" in merge
+    assert "ON CONFLICT (fingerprint) DO UPDATE" in merge
+    assert "IS DISTINCT FROM (EXCLUDED.Price, EXCLUDED.Rating)" in merge
+    assert mock_cursor.copy_expert.call_args[0][0].startswith("COPY etl_data_staging ")
+    mock_connect.return_value.commit.assert_called_once()
+
+
+def test_load_to_postgres_upsert_refuses_legacy_duplicates_without_opt_in(sample_df, mocker):
+    mock_connect = mocker.patch("psycopg2.connect")
+    mock_cursor = mock_connect.return_value.cursor.return_value
+    mock_cursor.fetchone.side_effect = [(True,), (3,)]
+
+    with pytest.raises(ValueError, match="dedupe_existing"):
+        load_to_postgres(sample_df, {}, mode="upsert")
+
+    executed = [" ".join(c[0][0].split()) for c in mock_cursor.execute.call_args_list]
+    assert not any(q.startswith(("DELETE FROM", "UPDATE etl_data")) for q in executed)
+    mock_connect.return_value.commit.assert_not_called()
+
+
+def test_load_to_postgres_upsert_dedupes_legacy_rows_when_requested(sample_df, mocker):
+    mock_connect = mocker.patch("psycopg2.connect")
+    mock_cursor = mock_connect.return_value.cursor.return_value
+    mock_cursor.fetchone.side_effect = [(True,), (3,)]
+    mock_cursor.rowcount = 2
+
+    load_to_postgres(sample_df, {}, mode="upsert", dedupe_existing=True)
+
+    executed = [" ".join(c[0][0].split()) for c in mock_cursor.execute.call_args_list]
+    dedupe = next(i for i, q in enumerate(executed) if q.startswith("DELETE FROM etl_data"))
+    backfill = next(i for i, q in enumerate(executed) if q.startswith("UPDATE etl_data SET fingerprint"))
+    index = next(i for i, q in enumerate(executed) if "CREATE UNIQUE INDEX" in q)
+    assert dedupe < backfill < index
+    assert "ORDER BY Timestamp DESC NULLS LAST, id DESC" in executed[dedupe]
+    assert "WHERE rn > 1" in executed[dedupe]
+
+
+def test_load_to_postgres_upsert_backfills_legacy_rows_without_duplicates(sample_df, mocker):
+    mock_connect = mocker.patch("psycopg2.connect")
+    mock_cursor = mock_connect.return_value.cursor.return_value
+    mock_cursor.fetchone.side_effect = [(True,), (0,)]
+
+    load_to_postgres(sample_df, {}, mode="upsert")
+
+    executed = [" ".join(c[0][0].split()) for c in mock_cursor.execute.call_args_list]
+    assert any(q.startswith("UPDATE etl_data SET fingerprint") for q in executed)
+    assert not any(q.startswith("DELETE FROM") for q in executed)
+    mock_connect.return_value.commit.assert_called_once()
+
+
+def test_load_to_postgres_upsert_skips_backfill_when_fingerprints_present(sample_df, mocker):
+    mock_connect = mocker.patch("psycopg2.connect")
+    mock_cursor = mock_connect.return_value.cursor.return_value
+    mock_cursor.fetchone.return_value = (False,)
+
+    load_to_postgres(sample_df, {}, mode="upsert")
+
+    executed = [" ".join(c[0][0].split()) for c in mock_cursor.execute.call_args_list]
+    assert not any(q.startswith(("DELETE FROM", "UPDATE etl_data")) for q in executed)
+
+
+def test_load_to_postgres_unknown_mode(sample_df, mocker):
+    mocker.patch("psycopg2.connect")
+    with pytest.raises(ValueError):
+        load_to_postgres(sample_df, {}, mode="replace")
+
+
+def test_load_to_gsheets_retries_on_quota_error(sample_df, mocker):
+    mock_client = mocker.Mock()
+    mocker.patch("gspread.authorize", return_value=mock_client)
+    mocker.patch("oauth2client.service_account.ServiceAccountCredentials.from_json_keyfile_name")
+    sleep = mocker.patch("utils.load.time.sleep")
+    sheet = mock_client.open_by_key.return_value.sheet1
+    sheet.get_all_values.return_value = []
+    quota_response = mocker.Mock()
+    quota_response.json.return_value = {"error": {"code": 429, "message": "Quota exceeded", "status": "RESOURCE_EXHAUSTED"}}
+    sheet.batch_update.side_effect = [gspread.exceptions.APIError(quota_response), None]
+
+    load_to_gsheets(sample_df, spreadsheet_id="test_id")
+
+    assert sheet.batch_update.call_count == 2
+    sleep.assert_called_once()
+
+
+def test_load_to_parquet_partitions_by_scrape_date(sample_df, tmp_path):
+    pytest.importorskip("pyarrow")
+    df = pd.concat([
+        sample_df,
+        sample_df.assign(Title="Shirt", Timestamp=pd.Timestamp("2025-08-15T08:30:00")),
+    ], ignore_index=True)
+    df["Size"] = df["Size"].astype("category")
+    directory = str(tmp_path / "snapshots")
+
+    load_to_parquet(df, directory)
+
+    assert sorted(os.listdir(directory)) == ["scrape_date=2025-08-14", "scrape_date=2025-08-15"]
+    result = read_parquet_snapshots(directory, start_date="2025-08-15")
+    assert result["Title"].tolist() == ["Shirt"]
+    assert pd.api.types.is_datetime64_any_dtype(result["Timestamp"])
+    assert isinstance(result["Size"].dtype, pd.CategoricalDtype)
+
+
+def test_load_to_parquet_rerun_replaces_partition(sample_df, tmp_path):
+    pytest.importorskip("pyarrow")
+    directory = str(tmp_path / "snapshots")
+
+    load_to_parquet(sample_df, directory)
+    load_to_parquet(sample_df.assign(Title="Coat"), directory)
+
+    result = read_parquet_snapshots(directory)
+    assert result["Title"].tolist() == ["Coat"]
+
+
+def test_load_to_parquet_empty_df():
+    with pytest.raises(ValueError):
+        load_to_parquet(pd.DataFrame())
+
+
+def test_csv_stream_writer_append_mode_keeps_single_header(sample_df, tmp_path):
+    for title in ["Jacket", "Shirt"]:
+        writer = CsvStreamWriter("append.csv", tmp_path, mode="append")
+        writer.write(sample_df.assign(Title=title))
+        writer.close()
+
+    result = pd.read_csv(tmp_path / "append.csv")
+    assert result["Title"].tolist() == ["Jacket", "Shirt"]
+
+
+def test_load_to_csv_append_mode(sample_df, tmp_path):
+    load_to_csv(sample_df, "append.csv", tmp_path, mode="append")
+    load_to_csv(sample_df.assign(Title="Shirt"), "append.csv", tmp_path, mode="append")
+
+    result = pd.read_csv(tmp_path / "append.csv")
+    assert result["Title"].tolist() == ["Jacket", "Shirt"]
+
+
+def test_csv_stream_writer_gzip_append(sample_df, tmp_path):
+    for title in ["Jacket", "Shirt"]:
+        writer = CsvStreamWriter("append.csv.gz", tmp_path, mode="append")
+        writer.write(sample_df.assign(Title=title))
+        writer.close()
+
+    result = pd.read_csv(tmp_path / "append.csv.gz")
+    assert result["Title"].tolist() == ["Jacket", "Shirt"]
+
+
+def test_csv_snapshot_is_atomic(sample_df, tmp_path):
+    path = load_to_csv(sample_df, "snap.csv", tmp_path)
+
+    writer = CsvStreamWriter("snap.csv", tmp_path)
+    writer.write(sample_df.assign(Title="Half Written"))
+    assert pd.read_csv(path)["Title"].tolist() == ["Jacket"]
+    writer.abort()
+
+    assert pd.read_csv(path)["Title"].tolist() == ["Jacket"]
+    assert os.listdir(tmp_path) == ["snap.csv"]
+
+
+def test_load_to_csv_gzip(sample_df, tmp_path):
+    path = load_to_csv(sample_df, "products.csv", tmp_path, compression="gzip")
+    assert pd.read_csv(path, compression="gzip")["Title"].tolist() == ["Jacket"]
@@ -0,0 +1,117 @@
+import sys
+
+import pandas as pd
+import pytest
+
+import main
+from benchmarks.server import ServerConfig, SyntheticServer
+
+
+def test_cli_runs_csv_only_without_loading_other_sinks(tmp_path, monkeypatch):
+    for module in ("gspread", "psycopg2", "oauth2client"):
+        monkeypatch.delitem(sys.modules, module, raising=False)
+    csv_path = tmp_path / "products.csv"
+
+    with SyntheticServer(ServerConfig(pages=2, products=5)) as server:
+        code = main.main([
+            "--sinks", "csv", "--pages", "2", "--workers", "2",
+            "--base-url", server.base_url, "--csv-file", str(csv_path),
+        ])
+
+    assert code == 0
+    assert len(pd.read_csv(csv_path)) > 0
+    assert not {"gspread", "psycopg2", "oauth2client"} & set(sys.modules)
+
+
+def test_cli_requires_spreadsheet_id_only_for_gsheets(monkeypatch):
+    monkeypatch.delenv("SPREADSHEET_ID", raising=False)
+    args = main.build_parser().parse_args(["--sinks", "csv,parquet", "--parquet-dir", "out"])
+
+    sinks, options = main.sink_options(args)
+
+    assert sinks == ["csv", "parquet"]
+    assert "spreadsheet_id" not in options and "db_config" not in options
+
+
+def test_cli_replays_archive_without_network(tmp_path):
+    archive = str(tmp_path / "pages.jsonl.gz")
+    live_csv, replay_csv = tmp_path / "live.csv", tmp_path / "replay.csv"
+
+    with SyntheticServer(ServerConfig(pages=2, products=5)) as server:
+        assert main.main([
+            "--sinks", "csv", "--pages", "2", "--base-url", server.base_url,
+            "--csv-file", str(live_csv), "--archive", archive,
+        ]) == 0
+        base_url = server.base_url
+
+    code = main.main([
+        "--sinks", "csv", "--pages", "2", "--workers", "2", "--base-url", base_url,
+        "--csv-file", str(replay_csv), "--archive", archive, "--replay",
+    ])
+
+    assert code == 0
+    pd.testing.assert_frame_equal(pd.read_csv(replay_csv), pd.read_csv(live_csv))
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_cli_csv_append_mode_accumulates_runs(tmp_path, streaming):
+    csv_path = tmp_path / "products.csv"
+    argv = ["--sinks", "csv", "--pages", "2", "--csv-file", str(csv_path), "--csv-mode", "append"]
+    if streaming:
+        argv.append("--streaming")
+
+    with SyntheticServer(ServerConfig(pages=2, products=5)) as server:
+        assert main.main(argv + ["--base-url", server.base_url]) == 0
+        first = len(pd.read_csv(csv_path))
+        assert main.main(argv + ["--base-url", server.base_url]) == 0
+
+    result = pd.read_csv(csv_path)
+    assert first > 0
+    assert len(result) == 2 * first
+    assert "Title" not in result["Title"].tolist()
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_cli_seen_index_rerun_without_changes_succeeds(tmp_path, streaming):
+    csv_path = tmp_path / "products.csv"
+    argv = [
+        "--sinks", "csv", "--csv-mode", "append", "--pages", "2", "--csv-file", str(csv_path),
+        "--seen-index", str(tmp_path / "seen.sqlite"),
+    ]
+    if streaming:
+        argv.append("--streaming")
+
+    with SyntheticServer(ServerConfig(pages=2, products=5)) as server:
+        assert main.main(argv + ["--base-url", server.base_url]) == 0
+        first = len(pd.read_csv(csv_path))
+        assert main.main(argv + ["--base-url", server.base_url]) == 0
+
+    assert first > 0
+    assert len(pd.read_csv(csv_path)) == first
+
+
+def test_cli_rejects_seen_index_with_snapshot_sinks(tmp_path):
+    with pytest.raises(SystemExit):
+        main.main(["--sinks", "csv", "--seen-index", str(tmp_path / "seen.sqlite")])
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_cli_fails_when_extract_returns_nothing(tmp_path, requests_mock, streaming):
+    requests_mock.get("http://etl.invalid/", status_code=404)
+    csv_path = tmp_path / "products.csv"
+    argv = ["--sinks", "csv", "--pages", "1", "--base-url", "http://etl.invalid", "--csv-file", str(csv_path)]
+    if streaming:
+        argv.append("--streaming")
+
+    assert main.main(argv) == 1
+    assert not csv_path.exists()
+
+
+def test_cli_validates_replay_as_of(tmp_path, capsys):
+    archive = str(tmp_path / "pages.jsonl.gz")
+    with pytest.raises(SystemExit):
+        main.main(["--sinks", "csv", "--archive", archive, "--replay", "--replay-as-of", "yesterday"])
+    assert "timestamp ISO tidak valid" in capsys.readouterr().err
+
+    args = main.build_parser().parse_args(["--replay-as-of", "2025-08-21T00:00+07:00"])
+    assert args.replay_as_of.tzinfo is None
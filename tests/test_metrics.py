@@ -0,0 +1,43 @@
+import json
+
+from utils.metrics import MetricsRegistry
+
+
+def test_registry_counts_gauges_and_histograms():
+    reg = MetricsRegistry()
+    reg.inc("rows_total", 3, sink="csv")
+    reg.inc("rows_total", 2, sink="csv")
+    reg.set("rate", 1.5)
+    reg.observe("latency_seconds", 0.02, status=200)
+    reg.observe("latency_seconds", 3.0, status=200)
+
+    assert reg.value("rows_total", sink="csv") == 5
+    assert reg.value("rate") == 1.5
+    hist = reg.to_dict()["histograms"]["latency_seconds"][0]
+    assert hist["labels"] == {"status": "200"}
+    assert hist["count"] == 2
+    assert hist["buckets"]["0.025"] == 1
+    assert hist["buckets"]["+Inf"] == 2
+
+
+def test_registry_exports_prometheus_and_json(tmp_path):
+    reg = MetricsRegistry()
+    reg.describe("rows_total", "counter", "Baris per sink.")
+    reg.describe("latency_seconds", "histogram", "Latency.", buckets=(0.1, 1.0))
+    reg.inc("rows_total", 4, sink='c"sv')
+    reg.observe("latency_seconds", 0.5)
+
+    text = reg.to_prometheus()
+    assert "# HELP rows_total Baris per sink." in text
+    assert "# TYPE rows_total counter" in text
+    assert 'rows_total{sink="c\\"sv"} 4' in text
+    assert 'latency_seconds_bucket{le="0.1"} 0' in text
+    assert 'latency_seconds_bucket{le="1.0"} 1' in text
+    assert "latency_seconds_count 1" in text
+
+    reg.write_prometheus(str(tmp_path / "etl.prom"))
+    reg.write_json(str(tmp_path / "report.json"), status="ok")
+    assert (tmp_path / "etl.prom").read_text() == text
+    report = json.loads((tmp_path / "report.json").read_text())
+    assert report["status"] == "ok"
+    assert report["counters"]["rows_total"][0]["value"] == 4
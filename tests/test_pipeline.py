@@ -0,0 +1,149 @@
+import pandas as pd
+import pytest
+import threading
+from utils.pipeline import SINKS, build_sinks, build_writers, run_sinks, run_streaming, snapshot_sinks
+
+
+def _page_url(page_num):
+    if page_num == 1:
+        return "https://fashion-studio.dicoding.dev/"
+    return f"https://fashion-studio.dicoding.dev/page{page_num}"
+
+
+def _card(title, price):
+    return (
+        f'<div class="product-card"><h3 class="product-title">{title}</h3>'
+        f'<span class="product-price">${price}</span>'
+        f'<p class="product-rating">4.5 / 5</p><p class="product-colors">3 Colors</p>'
+        f'<p class="product-size">Size: M</p><p class="product-gender">Gender: Men</p></div>'
+    )
+
+
+class CollectingWriter:
+    def __init__(self):
+        self.chunks = []
+        self.closed = False
+
+    def write(self, df):
+        self.chunks.append(df)
+
+    def close(self):
+        self.closed = True
+
+
+def test_run_streaming_writes_page_chunks_in_order(requests_mock):
+    """Setiap halaman menjadi satu chunk dan urutannya sesuai halaman."""
+    for page_num in range(1, 6):
+        requests_mock.get(_page_url(page_num), text=f"<html><body>{_card(f'Produk {page_num}', page_num)}</body></html>")
+
+    writer = CollectingWriter()
+    total = run_streaming([writer], pages=5, max_workers=2)
+
+    assert total == 5
+    assert writer.closed
+    assert len(writer.chunks) == 5
+    titles = pd.concat(writer.chunks)["Title"].tolist()
+    assert titles == [f"Produk {p}" for p in range(1, 6)]
+
+
+def test_run_streaming_with_parse_pool(requests_mock):
+    for page_num in range(1, 4):
+        requests_mock.get(_page_url(page_num), text=f"<html><body>{_card(f'Produk {page_num}', page_num)}</body></html>")
+
+    writer = CollectingWriter()
+    total = run_streaming([writer], pages=3, max_workers=2, parse_workers=2)
+
+    assert total == 3
+    assert pd.concat(writer.chunks)["Title"].tolist() == ["Produk 1", "Produk 2", "Produk 3"]
+
+
+def test_run_streaming_deduplicates_across_chunks(requests_mock):
+    """Produk yang sama di halaman berbeda hanya ditulis sekali."""
+    for page_num in range(1, 4):
+        html = f"<html><body>{_card('Same Jacket', 10)}{_card(f'Produk {page_num}', page_num)}</body></html>"
+        requests_mock.get(_page_url(page_num), text=html)
+
+    writer = CollectingWriter()
+    total = run_streaming([writer], pages=3)
+
+    titles = pd.concat(writer.chunks)["Title"].tolist()
+    assert total == 4
+    assert titles.count("Same Jacket") == 1
+
+
+def test_run_streaming_closes_writers_on_error(requests_mock):
+    """Writer tetap ditutup walaupun penulisan gagal."""
+    for page_num in range(1, 4):
+        requests_mock.get(_page_url(page_num), text=f"<html><body>{_card(f'Produk {page_num}', page_num)}</body></html>")
+
+    class FailingWriter(CollectingWriter):
+        def write(self, df):
+            raise OSError("disk penuh")
+
+    writer = FailingWriter()
+    with pytest.raises(OSError, match="disk penuh"):
+        run_streaming([writer], pages=3, queue_size=1)
+    assert writer.closed
+
+
+def test_run_sinks_runs_in_parallel_and_isolates_failures():
+    """Sink berjalan bersamaan dan sink yang gagal tidak menghentikan sink lain."""
+    df = pd.DataFrame({"Title": ["Jacket", "Shirt"]})
+    barrier = threading.Barrier(3, timeout=5)
+    written = []
+
+    def ok_sink(data):
+        barrier.wait()
+        written.append(len(data))
+
+    def failing_sink(data):
+        barrier.wait()
+        raise ConnectionError("database mati")
+
+    results = run_sinks(df, {"csv": ok_sink, "postgres": failing_sink, "gsheets": ok_sink})
+
+    assert list(results) == ["csv", "postgres", "gsheets"]
+    assert written == [2, 2]
+    assert results["csv"].ok and results["csv"].rows == 2
+    assert not results["postgres"].ok
+    assert isinstance(results["postgres"].error, ConnectionError)
+    assert all(r.seconds >= 0 for r in results.values())
+
+
+def test_run_sinks_without_sinks():
+    assert run_sinks(pd.DataFrame({"Title": ["A"]}), {}) == {}
+
+
+def test_run_sinks_skips_empty_frame_only_when_requested(tmp_path):
+    called = []
+    results = run_sinks(pd.DataFrame(columns=["Title"]), {"csv": called.append}, skip_empty=True)
+
+    assert results["csv"].ok and results["csv"].rows == 0
+    assert called == []
+
+    sinks = build_sinks(["csv"], {"csv_filename": str(tmp_path / "out.csv")})
+    assert not run_sinks(pd.DataFrame(columns=["Title"]), sinks)["csv"].ok
+
+
+def test_snapshot_sinks_depend_on_mode():
+    names = ["csv", "gsheets", "postgres", "parquet"]
+    assert snapshot_sinks(names, {}) == ["csv", "gsheets", "parquet"]
+    assert snapshot_sinks(names, {"csv_mode": "append"}) == ["gsheets", "parquet"]
+
+
+def test_sink_registry_builds_selected_sinks(tmp_path):
+    sinks = build_sinks(["csv"], {"csv_filename": str(tmp_path / "out.csv")})
+    results = run_sinks(pd.DataFrame({"Title": ["Jacket"]}), sinks)
+
+    assert list(results) == ["csv"] and results["csv"].ok
+    assert (tmp_path / "out.csv").exists()
+    assert {"csv", "gsheets", "postgres", "parquet"} <= set(SINKS)
+
+
+def test_sink_registry_rejects_unknown_or_misconfigured_sinks():
+    with pytest.raises(ValueError, match="tidak dikenal"):
+        build_sinks(["ftp"], {})
+    with pytest.raises(ValueError, match="spreadsheet_id"):
+        build_sinks(["gsheets"], {})
+    with pytest.raises(ValueError, match="streaming"):
+        build_writers(["parquet"], {"parquet_dir": "x"})
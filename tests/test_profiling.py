@@ -0,0 +1,43 @@
+import json
+import os
+
+import pandas as pd
+
+from utils.pipeline import run_sinks
+from utils.profiling import StageProfiler
+
+
+def _work():
+    return sorted(str(i) for i in range(20000))
+
+
+def test_profiler_writes_stats_and_memory_per_stage(tmp_path):
+    profiler = StageProfiler(str(tmp_path))
+
+    with profiler.stage("transform"):
+        _work()
+
+    for name in ("transform.pstats", "transform.txt", "transform-memory.txt", "summary.json"):
+        assert os.path.exists(tmp_path / name)
+    assert "_work" in (tmp_path / "transform.txt").read_text()
+    summary = json.loads((tmp_path / "summary.json").read_text())
+    assert summary["transform"]["peak_memory_bytes"] > 0
+
+
+def test_profiler_disabled_is_noop(tmp_path):
+    profiler = StageProfiler()
+    with profiler.stage("extract"):
+        _work()
+    assert not profiler.enabled
+    assert profiler.summary == {}
+
+
+def test_run_sinks_profiles_each_sink_in_calling_thread(tmp_path):
+    sample_df = pd.DataFrame({"Title": ["Jacket"]})
+    profiler = StageProfiler(str(tmp_path))
+
+    results = run_sinks(sample_df, {"a": lambda df: _work(), "b": lambda df: None}, profiler=profiler)
+
+    assert all(r.ok for r in results.values())
+    assert set(profiler.summary) == {"load-a", "load-b"}
+    assert "_work" in (tmp_path / "load-a.txt").read_text()
@@ -0,0 +1,58 @@
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+from utils.throttle import AdaptiveThrottle, parse_retry_after
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def _throttle(clock, **kwargs):
+    return AdaptiveThrottle(clock=clock, sleep=clock.sleep, **kwargs)
+
+
+def test_throttle_increases_on_success_and_halves_on_429():
+    clock = FakeClock()
+    throttle = _throttle(clock, initial_rate=2.0, increase=1.0, decrease=0.5)
+
+    throttle.record(200, 0.1)
+    throttle.record(200, 0.1)
+    assert throttle.rate == 4.0
+
+    throttle.record(429, 0.1)
+    assert throttle.rate == 2.0
+
+    throttle.record(None, 0.1)
+    throttle.record(200, 10.0)
+    assert throttle.rate == throttle.min_rate * 2.5
+
+
+def test_throttle_spaces_requests_and_honours_retry_after():
+    clock = FakeClock()
+    throttle = _throttle(clock, initial_rate=2.0, min_rate=0.1)
+
+    throttle.acquire()
+    throttle.acquire()
+    assert clock.sleeps == [0.5]
+
+    throttle.record(503, 0.1, retry_after=5.0)
+    throttle.acquire()
+    assert clock.now == 0.5 + 5.0
+
+
+def test_parse_retry_after():
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("7") == 7.0
+    assert parse_retry_after("bukan tanggal") is None
+    future = datetime.now(timezone.utc) + timedelta(seconds=30)
+    assert 25 < parse_retry_after(format_datetime(future, usegmt=True)) <= 30
@@ -1,6 +1,10 @@
+import numpy as np
 import pandas as pd
 import pytest
-from utils.transform import transform
+import utils.transform as transform_module
+from utils.extract import ProductColumns
+from utils.metrics import MetricsRegistry
+from utils.transform import transform, transform_iter, _sorted_contains
 
 @pytest.fixture
 def sample_raw_data():
@@ -61,4 +65,128 @@ def test_transform_edge_cases_and_duplicates():
     
     assert df["Title"].nunique() == len(df)
     assert "Good Shirt" in df["Title"].values
-    assert "Non-string Size" in df["Title"].values
\ No newline at end of file
+    assert "Non-string Size" in df["Title"].values
+
+def _messy_rows():
+    return [
+        {"Title": "Cool Jacket", "Price": "$10.00", "Rating": "Rating: ⭐ 4.8 / 5", "Colors": "3 Colors", "Size": "Size: M", "Gender": "Gender: Men", "Timestamp": "2025-08-14T12:00:00.123456"},
+        {"Title": "Odd Price", "Price": "$ 0.1", "Rating": "3", "Colors": "10 colors", "Size": "size:xl ", "Gender": "GENDER:  Women", "Timestamp": "2025-08-14T12:00:01"},
+        {"Title": "Numeric Fields", "Price": 12.5, "Rating": 4, "Colors": 2, "Size": 38, "Gender": "Unisex", "Timestamp": "2025-08-14T12:00:02"},
+        {"Title": "Nan Size", "Price": "$99.99", "Rating": "4.1 / 5", "Colors": "1 Color", "Size": float("nan"), "Gender": None, "Timestamp": "2025-08-14T12:00:03"},
+        {"Title": "No Digits", "Price": "$abc", "Rating": "none", "Colors": "many", "Size": "S", "Gender": "Men", "Timestamp": "2025-08-14T12:00:04"},
+        {"Title": "Precise", "Price": "$123.456789012345", "Rating": "4.9999999999 / 5", "Colors": "007 Colors", "Size": "Size:  L", "Gender": "Gender: Men", "Timestamp": "2025-08-14T12:00:05"},
+        {"Title": "Cool Jacket", "Price": "$10.00", "Rating": "4.8 / 5", "Colors": "3 Colors", "Size": "M", "Gender": "Men", "Timestamp": "2025-08-14T12:00:06"},
+    ]
+
+
+@pytest.mark.parametrize("rows_factory", [_messy_rows, lambda: [
+    {"Title": "Cool Jacket", "Price": "$10.00", "Rating": "4.8 / 5", "Colors": "3 Colors", "Size": "Size: M", "Gender": "Gender: Men", "Timestamp": "2025-08-14T12:00:00.123456"},
+    {"Title": "Unknown Product", "Price": "$15.00", "Rating": "5/5", "Colors": "2 Colors", "Size": "L", "Gender": "Unisex", "Timestamp": "2025-08-14T12:00:02.123456"},
+    {"Title": "Bad Hat", "Price": "$5.00", "Rating": "Invalid Rating", "Colors": "5", "Size": "M", "Gender": "Men", "Timestamp": "2025-08-14T12:00:03.123456"},
+]])
+def test_transform_engines_are_identical(rows_factory):
+    """Engine vectorized dan python menghasilkan DataFrame dan CSV yang sama persis."""
+    df_python = transform(rows_factory(), engine="python")
+    df_vectorized = transform(rows_factory(), engine="vectorized")
+
+    pd.testing.assert_frame_equal(df_vectorized, df_python)
+    assert df_vectorized.to_csv(index=False) == df_python.to_csv(index=False)
+
+
+def test_transform_unknown_engine():
+    with pytest.raises(ValueError):
+        transform([{"Title": "A"}], engine="numba")
+
+
+def test_transform_low_cardinality_columns_are_categorical(sample_raw_data):
+    df = transform(sample_raw_data)
+    assert isinstance(df["Size"].dtype, pd.CategoricalDtype)
+    assert isinstance(df["Gender"].dtype, pd.CategoricalDtype)
+    assert set(df["Size"].cat.categories) == {"M", "S"}
+
+
+def test_transform_parses_each_distinct_value_once(mocker):
+    """Engine vectorized hanya mem-parse nilai unik, bukan setiap baris."""
+    rows = [
+        {"Title": f"Shirt {i}", "Price": "$10.00", "Rating": "4.5 / 5", "Colors": "3 Colors",
+         "Size": "Size: M", "Gender": "Gender: Men", "Timestamp": "2025-08-19T10:00:00"}
+        for i in range(100)
+    ]
+    spy = mocker.spy(transform_module, "_float_column")
+
+    df = transform(rows, engine="vectorized")
+
+    assert len(df) == 100
+    assert all(len(call.args[0]) == 1 for call in spy.call_args_list)
+
+
+def test_transform_iter_deduplicates_across_chunks():
+    def row(title, size, ts):
+        return {"Title": title, "Price": "$10.00", "Rating": "4.5 / 5", "Colors": "3 Colors",
+                "Size": f"Size: {size}", "Gender": "Gender: Men", "Timestamp": ts}
+
+    chunks = [
+        [row("Shirt", "M", "2025-08-19T10:00:00"), row("Hat", "S", "2025-08-19T10:00:00")],
+        [row("Shirt", "M", "2025-08-19T10:00:05"), row("Shirt", "L", "2025-08-19T10:00:05")],
+        [],
+        [row("Hat", "S", "2025-08-19T10:00:09")],
+    ]
+
+    result = list(transform_iter(iter(chunks)))
+
+    assert len(result) == 2
+    combined = pd.concat(result, ignore_index=True)
+    assert list(zip(combined["Title"], combined["Size"].astype(str))) == [("Shirt", "M"), ("Hat", "S"), ("Shirt", "L")]
+    assert combined["Timestamp"].iloc[0] == pd.Timestamp("2025-08-19T10:00:00")
+
+
+def test_sorted_contains_checks_membership_at_array_edges():
+    seen = np.array([3, 10, 2**64 - 1], dtype=np.uint64)
+    values = np.array([0, 3, 5, 10, 11, 2**64 - 1], dtype=np.uint64)
+
+    assert _sorted_contains(seen, values).tolist() == [False, True, False, True, False, True]
+    assert not _sorted_contains(np.empty(0, dtype=np.uint64), values).any()
+
+
+def test_transform_iter_matches_transform_on_single_chunk(sample_raw_data):
+    (chunk,) = list(transform_iter([sample_raw_data]))
+    pd.testing.assert_frame_equal(chunk, transform(sample_raw_data))
+
+
+def test_transform_records_dropped_rows_by_reason(mocker):
+    registry = mocker.patch.object(transform_module, "REGISTRY", MetricsRegistry())
+    rows = _messy_rows() + [
+        {"Title": "Unknown Product", "Price": "$15.00", "Rating": "5/5", "Colors": "2 Colors", "Size": "L", "Gender": "Unisex", "Timestamp": "2025-08-14T12:00:07"},
+        {"Title": "Bad Hat", "Price": "$5.00", "Rating": "Invalid Rating", "Colors": "5", "Size": "M", "Gender": "Men", "Timestamp": "2025-08-14T12:00:08"},
+        {"Title": "Precise", "Price": "$123.456789012345", "Rating": "4.9999999999 / 5", "Colors": "007 Colors", "Size": "Size:  L", "Gender": "Gender: Men", "Timestamp": "2025-08-14T12:00:09"},
+    ]
+
+    df = transform(rows)
+
+    dropped = {
+        reason: registry.value("etl_transform_rows_dropped_total", reason=reason)
+        for reason in ("invalid_title", "invalid_rating", "unparseable", "duplicate")
+    }
+    assert dropped["invalid_title"] == 1
+    assert dropped["invalid_rating"] == 1
+    assert dropped["duplicate"] == 2
+    assert registry.value("etl_transform_rows_in_total") == len(rows)
+    assert registry.value("etl_transform_rows_out_total") == len(df)
+    assert len(rows) - len(df) == sum(v or 0 for v in dropped.values())
+
+
+def test_transform_iter_counts_rows_out_after_cross_chunk_dedupe(sample_raw_data, mocker):
+    registry = mocker.patch.object(transform_module, "REGISTRY", MetricsRegistry())
+    registry.inc = mocker.spy(registry, "inc")
+
+    chunks = list(transform_iter([sample_raw_data, sample_raw_data]))
+
+    assert registry.value("etl_transform_rows_out_total") == sum(len(c) for c in chunks)
+    assert all(c.args[1] >= 0 for c in registry.inc.call_args_list if len(c.args) > 1)
+
+
+def test_transform_accepts_column_batches(sample_raw_data):
+    columns = ProductColumns()
+    columns.extend(sample_raw_data)
+
+    pd.testing.assert_frame_equal(transform(columns), transform(sample_raw_data))
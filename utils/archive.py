@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+import os
+import threading
+import zlib
+from datetime import datetime
+from typing import Dict, Iterator, List, Mapping, Optional, Tuple, Union
+
+logging.basicConfig(level=logging.INFO, format="%(levelname)s - %(message)s")
+
+ARCHIVE_PATH = os.path.join(".cache", "pages.jsonl.gz")
+_SCAN_CHUNK = 1 << 16
+
+
+def parse_as_of(value: Union[str, datetime]) -> datetime:
+    """
+    Ubah timestamp ISO (atau datetime) menjadi datetime naive waktu lokal,
+    sama seperti timestamp di arsip (datetime.now().isoformat()). Nilai
+    yang punya zona waktu (misal "2025-08-21T00:00+07:00") dikonversi ke
+    waktu lokal. Teks yang bukan ISO memunculkan ValueError.
+    """
+    dt = datetime.fromisoformat(value) if isinstance(value, str) else value
+    if dt.tzinfo is not None:
+        dt = dt.astimezone().replace(tzinfo=None)
+    return dt
+
+
+class PageArchive:
+    """
+    Arsip HTML mentah yang hanya bisa ditambah (append-only). Setiap halaman
+    disimpan sebagai satu member gzip berisi satu baris JSON (url, status,
+    headers, timestamp, body), jadi file tetap valid untuk `zcat`/gzip.open.
+    File sidecar `<path>.idx` mencatat offset dan panjang tiap member
+    sehingga get(url) cukup membaca dan mendekompresi satu member. Semua
+    versi sebuah URL disimpan; get(url, as_of=...) memilih versi yang
+    diambil paling akhir sebelum atau tepat pada waktu tersebut. Bila
+    sidecar hilang atau tertinggal dari arsip (misal proses mati di tengah
+    penulisan), indeks dibangun ulang dengan memindai arsip.
+    """
+
+    def __init__(self, path: str = ARCHIVE_PATH):
+        self.path = path
+        self.index_path = f"{path}.idx"
+        self._lock = threading.Lock()
+        self._index: Dict[str, List[Tuple[int, int, str]]] = {}
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._load_index()
+
+    def _load_index(self) -> None:
+        size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        end = 0
+        try:
+            with open(self.index_path, encoding="utf-8") as f:
+                for line in f:
+                    entry = json.loads(line)
+                    self._index.setdefault(entry["url"], []).append(
+                        (entry["offset"], entry["length"], entry["timestamp"])
+                    )
+                    end = max(end, entry["offset"] + entry["length"])
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError) as e:
+            logging.warning(f"Indeks arsip '{self.index_path}' rusak, dibangun ulang: {e}")
+            end = -1
+        if end != size:
+            self._rebuild_index()
+
+    def _rebuild_index(self) -> None:
+        self._index.clear()
+        lines = []
+        for offset, length, record in self._scan():
+            self._index.setdefault(record["url"], []).append((offset, length, record["timestamp"]))
+            lines.append(json.dumps({"url": record["url"], "offset": offset, "length": length, "timestamp": record["timestamp"]}))
+        tmp_path = f"{self.index_path}.tmp-{os.getpid()}"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write("".join(line + "\n" for line in lines))
+        os.replace(tmp_path, self.index_path)
+        logging.info(f"Indeks arsip dibangun ulang: {len(self._index)} URL")
+
+    def _scan(self) -> Iterator[Tuple[int, int, dict]]:
+        """
+        Pindai semua member gzip beserta offset dan panjangnya. File dibaca
+        per _SCAN_CHUNK byte dan sisa data setelah satu member (unused_data)
+        diteruskan ke member berikutnya, jadi waktu dan memori pemindaian
+        linear terhadap ukuran arsip. Member terakhir yang terpotong diabaikan.
+        """
+        try:
+            f = open(self.path, "rb")
+        except FileNotFoundError:
+            return
+        with f:
+            offset = 0
+            data = b""
+            while True:
+                d = zlib.decompressobj(wbits=31)
+                parts = []
+                length = 0
+                while not d.eof:
+                    if not data:
+                        data = f.read(_SCAN_CHUNK)
+                        if not data:
+                            break
+                    try:
+                        parts.append(d.decompress(data))
+                    except zlib.error:
+                        logging.warning(f"Arsip rusak mulai offset {offset}, sisa data diabaikan.")
+                        return
+                    length += len(data) - len(d.unused_data)
+                    data = d.unused_data
+                if not d.eof:
+                    if length:
+                        logging.warning(f"Member terakhir arsip terpotong (offset {offset}), diabaikan.")
+                    return
+                yield offset, length, json.loads(b"".join(parts))
+                offset += length
+
+    def append(
+        self,
+        url: str,
+        body: str,
+        headers: Optional[Mapping[str, str]] = None,
+        status: int = 200,
+        timestamp: Optional[str] = None,
+    ) -> None:
+        record = {
+            "url": url,
+            "status": status,
+            "headers": dict(headers or {}),
+            "timestamp": timestamp or datetime.now().isoformat(),
+            "body": body,
+        }
+        member = gzip.compress((json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8"))
+        with self._lock:
+            with open(self.path, "ab") as f:
+                offset = f.tell()
+                f.write(member)
+            entry = {"url": url, "offset": offset, "length": len(member), "timestamp": record["timestamp"]}
+            with open(self.index_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+            self._index.setdefault(url, []).append((offset, len(member), record["timestamp"]))
+
+    def get(self, url: str, as_of: Union[str, datetime, None] = None) -> Optional[dict]:
+        """
+        Rekaman terbaru untuk url, atau None bila belum diarsipkan.
+        as_of (datetime atau timestamp ISO, misal "2025-08-20" atau
+        "2025-08-19T12:00"; lihat parse_as_of) memilih versi terbaru yang
+        timestamp-nya <= as_of, sehingga scrape lama tetap bisa diputar ulang.
+        """
+        with self._lock:
+            versions = list(self._index.get(url, ()))
+        if as_of is not None:
+            cutoff = parse_as_of(as_of)
+            versions = [v for v in versions if parse_as_of(v[2]) <= cutoff]
+        if not versions:
+            return None
+        offset, length, _ = max(versions, key=lambda v: (parse_as_of(v[2]), v[0]))
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            return json.loads(gzip.decompress(f.read(length)))
+
+    def __contains__(self, url: str) -> bool:
+        with self._lock:
+            return url in self._index
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._index)
+
+    def timestamps(self, url: str) -> List[str]:
+        """
+        Timestamp semua versi url yang tersimpan, urut dari yang terlama.
+        """
+        with self._lock:
+            versions = list(self._index.get(url, ()))
+        return sorted((v[2] for v in versions), key=parse_as_of)
+
+    def __iter__(self) -> Iterator[dict]:
+        """
+        Semua rekaman sesuai urutan penulisan (termasuk versi lama sebuah URL).
+        """
+        for _, _, record in self._scan():
+            yield record
+
+
+__all__ = ["PageArchive", "ARCHIVE_PATH", "parse_as_of"]
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from typing import Dict, List, Optional
+
+logging.basicConfig(level=logging.INFO, format="%(levelname)s - %(message)s")
+
+CACHE_DIR = os.path.join(".cache", "pages")
+SELECTOR_MEMO_PATH = os.path.join(".cache", "selectors.json")
+
+
+def _atomic_write_json(path: str, data: object) -> None:
+    """
+    Tulis JSON ke file sementara lalu rename, supaya file tidak pernah setengah jadi.
+    """
+    tmp_path = f"{path}.tmp-{os.getpid()}-{threading.get_ident()}"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+class PageCache:
+    """
+    Cache halaman HTML di disk, satu file JSON per URL.
+    Menyimpan body, ETag/Last-Modified untuk conditional GET, dan
+    baris produk hasil ekstraksi agar halaman yang tidak berubah (304)
+    tidak perlu di-parse ulang.
+    """
+
+    def __init__(self, directory: str = CACHE_DIR):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, url: str) -> str:
+        key = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, url: str) -> Optional[dict]:
+        try:
+            with open(self._path(url), encoding="utf-8") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logging.warning(f"Cache untuk {url} tidak bisa dibaca, diabaikan: {e}")
+            return None
+        return entry if entry.get("url") == url else None
+
+    def put(
+        self,
+        url: str,
+        body: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        rows: Optional[List[Dict[str, str]]] = None,
+    ) -> None:
+        entry = {
+            "url": url,
+            "body": body,
+            "etag": etag,
+            "last_modified": last_modified,
+            "rows": rows,
+        }
+        try:
+            _atomic_write_json(self._path(url), entry)
+        except OSError as e:
+            logging.warning(f"Gagal menyimpan cache untuk {url}: {e}")
+
+    @staticmethod
+    def conditional_headers(entry: Optional[dict]) -> Dict[str, str]:
+        """
+        Header If-None-Match / If-Modified-Since dari entry cache.
+        """
+        headers: Dict[str, str] = {}
+        if not entry:
+            return headers
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+
+class SelectorMemo:
+    """
+    Mengingat selector card produk yang terakhir berhasil untuk tiap situs
+    dan menyimpannya ke file JSON agar dipakai lagi pada run berikutnya.
+    """
+
+    def __init__(self, path: str = SELECTOR_MEMO_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._selectors: Dict[str, str] = {}
+        try:
+            with open(path, encoding="utf-8") as f:
+                self._selectors = dict(json.load(f))
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, TypeError) as e:
+            logging.warning(f"File memo selector '{path}' tidak bisa dibaca, diabaikan: {e}")
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            return self._selectors.get(key)
+
+    def set(self, key: str, selector: str) -> None:
+        with self._lock:
+            if self._selectors.get(key) == selector:
+                return
+            self._selectors[key] = selector
+            self._save()
+
+    def forget(self, key: str) -> None:
+        with self._lock:
+            if self._selectors.pop(key, None) is not None:
+                self._save()
+
+    def _save(self) -> None:
+        try:
+            if os.path.dirname(self.path):
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            _atomic_write_json(self.path, self._selectors)
+        except OSError as e:
+            logging.warning(f"Gagal menyimpan memo selector ke '{self.path}': {e}")
+
+
+__all__ = ["PageCache", "SelectorMemo"]
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+import threading
+from typing import Dict, List, Optional, Set
+
+from utils.cache import _atomic_write_json
+
+logging.basicConfig(level=logging.INFO, format="%(levelname)s - %(message)s")
+
+CHECKPOINT_DIR = os.path.join(".cache", "checkpoint")
+_PAGE_FILE_RE = re.compile(r"^page-(\d+)\.json$")
+_OWNED_FILE_RE = re.compile(r"^(page-\d+|failed)\.json(\.tmp-[\d-]+)?$")
+
+
+class CheckpointStore:
+    """
+    Simpan progres extract ke disk selama run berjalan: satu file JSON per
+    halaman yang berhasil (berisi baris produknya) dan failed.json untuk
+    daftar halaman yang gagal. Dengan resume, run berikutnya hanya
+    mengambil halaman yang belum ada atau sebelumnya gagal.
+    """
+
+    def __init__(self, directory: str = CHECKPOINT_DIR):
+        self.directory = directory
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _page_path(self, page: int) -> str:
+        return os.path.join(self.directory, f"page-{page:05d}.json")
+
+    @property
+    def _failed_path(self) -> str:
+        return os.path.join(self.directory, "failed.json")
+
+    def completed_pages(self) -> Set[int]:
+        pages = set()
+        for name in os.listdir(self.directory):
+            m = _PAGE_FILE_RE.match(name)
+            if m:
+                pages.add(int(m.group(1)))
+        return pages
+
+    def failed_pages(self) -> Set[int]:
+        try:
+            with open(self._failed_path, encoding="utf-8") as f:
+                return set(json.load(f))
+        except FileNotFoundError:
+            return set()
+        except (OSError, ValueError) as e:
+            logging.warning(f"Daftar halaman gagal tidak bisa dibaca, diabaikan: {e}")
+            return set()
+
+    def load_page(self, page: int) -> Optional[List[Dict[str, str]]]:
+        try:
+            with open(self._page_path(page), encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logging.warning(f"Checkpoint page {page} rusak, akan diambil ulang: {e}")
+            return None
+
+    def save_page(self, page: int, rows: List[Dict[str, str]]) -> None:
+        with self._lock:
+            _atomic_write_json(self._page_path(page), rows)
+            failed = self.failed_pages()
+            if page in failed:
+                failed.discard(page)
+                _atomic_write_json(self._failed_path, sorted(failed))
+
+    def mark_failed(self, page: int) -> None:
+        with self._lock:
+            failed = self.failed_pages()
+            failed.add(page)
+            _atomic_write_json(self._failed_path, sorted(failed))
+
+    def clear(self) -> None:
+        """
+        Hapus file checkpoint milik store ini (page-*.json, failed.json dan
+        file sementaranya); file lain di folder yang sama tidak disentuh.
+        """
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            for name in os.listdir(self.directory):
+                if _OWNED_FILE_RE.match(name):
+                    try:
+                        os.remove(os.path.join(self.directory, name))
+                    except FileNotFoundError:
+                        pass
+
+
+__all__ = ["CheckpointStore", "CHECKPOINT_DIR"]
@@ -1,24 +1,44 @@
 from __future__ import annotations
 
 import logging
+import multiprocessing
 import re
-from dataclasses import dataclass, asdict
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, fields
 from datetime import datetime
-from typing import List, Dict
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Tuple
 
+import pandas as pd
 import requests
-from bs4 import BeautifulSoup, Tag
+from bs4 import BeautifulSoup, NavigableString, Tag
+from bs4.builder import builder_registry
 from requests.adapters import HTTPAdapter, Retry
 
+from utils.archive import PageArchive, parse_as_of
+from utils.cache import PageCache, SelectorMemo
+from utils.checkpoint import CheckpointStore
+from utils.metrics import REGISTRY
+from utils.throttle import BACKOFF_STATUSES, AdaptiveThrottle, parse_retry_after
+
 logging.basicConfig(level=logging.INFO, format="%(levelname)s - %(message)s")
 
 BASE_URL = "https://fashion-studio.dicoding.dev"
 TIMEOUT = 15
 TOTAL_PAGES = 50
+MAX_WORKERS = 8
+PARSERS = ("lxml", "html.parser")
+DEFAULT_PARSER = "auto"
 
 
 @dataclass
 class ProductRaw:
+    # __slots__ ditulis manual (bukan dataclass(slots=True), yang butuh
+    # Python 3.10) supaya setiap produk tidak membawa __dict__.
+    __slots__ = ("Title", "Price", "Rating", "Colors", "Size", "Gender", "Timestamp")
+
     Title: str
     Price: str
     Rating: str
@@ -27,14 +47,52 @@ class ProductRaw:
     Gender: str
     Timestamp: str
 
+    def to_row(self) -> Dict[str, str]:
+        """
+        Dict satu baris tanpa deep copy seperti dataclasses.asdict.
+        """
+        return {name: getattr(self, name) for name in PRODUCT_FIELDS}
+
+
+PRODUCT_FIELDS = tuple(f.name for f in fields(ProductRaw))
+
+
+class ProductColumns:
+    """
+    Penampung hasil extract per kolom: satu list per field, bukan satu
+    dict per produk. Untuk scrape besar ini jauh lebih hemat memori, dan
+    transform bisa langsung membangun DataFrame dari kolomnya (to_frame).
+    """
 
-def _requests_session() -> requests.Session:
-    """Session dengan retry agar lebih tahan error jaringan."""
+    __slots__ = ("columns",)
+
+    def __init__(self):
+        self.columns: Dict[str, List[str]] = {name: [] for name in PRODUCT_FIELDS}
+
+    def __len__(self) -> int:
+        return len(self.columns["Title"])
+
+    def extend(self, rows: List[Dict[str, str]]) -> None:
+        for name, values in self.columns.items():
+            values.extend(row.get(name) for row in rows)
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(self.columns, columns=list(PRODUCT_FIELDS))
+
+
+def _requests_session(pool_size: int = 10, retry_statuses: bool = True) -> requests.Session:
+    """
+    Session dengan retry agar lebih tahan error jaringan.
+    pool_size mengatur jumlah koneksi per host yang disimpan di pool,
+    samakan dengan jumlah worker agar koneksi tidak dibuka-tutup terus.
+    retry_statuses=False mematikan retry otomatis untuk 429/5xx supaya
+    status itu sampai ke AdaptiveThrottle.
+    """
     s = requests.Session()
     retries = Retry(
         total=3,
         backoff_factor=0.5,
-        status_forcelist=[429, 500, 502, 503, 504],
+        status_forcelist=sorted(BACKOFF_STATUSES) if retry_statuses else [],
         allowed_methods=["GET"],
     )
     s.headers.update(
@@ -42,51 +100,219 @@ def _requests_session() -> requests.Session:
             "User-Agent": "Mozilla/5.0 (compatible; ETL-Pipeline/1.0; +https://example.local)"
         }
     )
-    s.mount("https://", HTTPAdapter(max_retries=retries))
-    s.mount("http://", HTTPAdapter(max_retries=retries))
+    adapter = HTTPAdapter(max_retries=retries, pool_maxsize=pool_size)
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)
     return s
 
 
-def _fetch_html(url: str, session: requests.Session) -> str:
+def _timed_get(
+    url: str, session: requests.Session, headers: Optional[Dict[str, str]]
+) -> Tuple[requests.Response, float]:
+    """
+    Satu GET yang dicatat ke metrik: latency per status dan byte body.
+    """
+    start = time.perf_counter()
     try:
-        resp = session.get(url, timeout=TIMEOUT)
+        resp = session.get(url, timeout=TIMEOUT, headers=headers)
+    except requests.exceptions.RequestException:
+        latency = time.perf_counter() - start
+        REGISTRY.observe("etl_http_request_seconds", latency, status="error")
+        REGISTRY.inc("etl_http_requests_total", status="error")
+        raise
+    latency = time.perf_counter() - start
+    REGISTRY.observe("etl_http_request_seconds", latency, status=resp.status_code)
+    REGISTRY.inc("etl_http_requests_total", status=resp.status_code)
+    REGISTRY.inc("etl_http_response_bytes_total", len(resp.content))
+    return resp, latency
+
+
+def _throttled_get(
+    url: str,
+    session: requests.Session,
+    headers: Optional[Dict[str, str]],
+    throttle: AdaptiveThrottle,
+) -> requests.Response:
+    """
+    GET dengan AdaptiveThrottle: setiap percobaan menunggu giliran, hasilnya
+    dilaporkan ke throttle, dan 429/5xx/error jaringan dicoba ulang sampai
+    throttle.max_attempts kali.
+    """
+    for attempt in range(1, throttle.max_attempts + 1):
+        throttle.acquire()
+        start = time.perf_counter()
+        try:
+            resp, latency = _timed_get(url, session, headers)
+        except requests.exceptions.RequestException:
+            throttle.record(None, time.perf_counter() - start)
+            if attempt == throttle.max_attempts:
+                raise
+            continue
+        throttle.record(
+            resp.status_code,
+            latency,
+            parse_retry_after(resp.headers.get("Retry-After")),
+        )
+        if resp.status_code not in BACKOFF_STATUSES or attempt == throttle.max_attempts:
+            return resp
+    return resp
+
+
+def _get(
+    url: str,
+    session: requests.Session,
+    headers: Optional[Dict[str, str]] = None,
+    throttle: AdaptiveThrottle | None = None,
+) -> requests.Response:
+    try:
+        if throttle:
+            resp = _throttled_get(url, session, headers, throttle)
+        else:
+            resp, _ = _timed_get(url, session, headers)
         resp.raise_for_status()
-        return resp.text
+        return resp
     except requests.exceptions.RequestException as e:
         logging.error(f"Gagal mengambil URL {url}: {e}")
         raise
 
 
-def _find_cards(soup: BeautifulSoup) -> List[Tag]:
+def _fetch_html(
+    url: str, session: requests.Session, throttle: AdaptiveThrottle | None = None
+) -> str:
+    return _get(url, session, throttle=throttle).text
+
+
+def _resolve_parser(parser: str = DEFAULT_PARSER) -> str:
     """
-    Mengembalikan list elemen card produk.
-    Selector sengaja fleksibel karena struktur situs bisa berbeda.
+    Pilih backend parser BeautifulSoup. "auto" memakai lxml bila terpasang,
+    jika tidak kembali ke html.parser bawaan Python.
+    """
+    if parser == "auto":
+        return "lxml" if builder_registry.lookup("lxml") else "html.parser"
+    if parser not in PARSERS:
+        raise ValueError(f"Parser '{parser}' tidak dikenal. Pilihan: auto, {', '.join(PARSERS)}")
+    if builder_registry.lookup(parser) is None:
+        logging.warning(f"Parser '{parser}' tidak terpasang, memakai html.parser.")
+        return "html.parser"
+    return parser
+
+
+def _make_soup(html: str, parser: str = DEFAULT_PARSER) -> BeautifulSoup:
+    """
+    Parse HTML dengan backend yang dipilih. Semua backend menghasilkan tree
+    BeautifulSoup yang sama, jadi _find_cards/_extract_with_patterns tidak berubah.
+    """
+    return BeautifulSoup(html, _resolve_parser(parser))
+
+
+PRICE_RE = re.compile(r"\$\s*\d")
+RATING_RE = re.compile(r"\d+(\.\d+)?\s*/\s*5")
+RATING_NUMBER_RE = re.compile(r"^\d+(\.\d+)?$")
+COLORS_RE = re.compile(r"Colors?", re.I)
+SIZE_RE = re.compile(r"Size", re.I)
+GENDER_RE = re.compile(r"Gender", re.I)
+
+FIELD_CLASSES = frozenset(
+    {
+        "product-title",
+        "product-price",
+        "product-rating",
+        "product-colors",
+        "product-size",
+        "product-gender",
+    }
+)
+HEADING_TAGS = frozenset({"h2", "h3", "h4"})
+STRING_PATTERNS = [
+    ("price", PRICE_RE),
+    ("rating", RATING_RE),
+    ("rating_number", RATING_NUMBER_RE),
+    ("colors", COLORS_RE),
+    ("size", SIZE_RE),
+    ("gender", GENDER_RE),
+]
+
+CARD_SELECTORS = [
+    ".product-card",
+    ".card.product",
+    "article.product",
+    "div.product",
+    "li.product",
+    "[data-testid='product-card']",
+]
+
+
+def _scan_cards(soup: BeautifulSoup) -> List[Tag]:
+    """
+    Fallback mahal: periksa setiap div/article/li yang berisi judul dan harga.
     """
-    candidates = [
-        ".product-card",
-        ".card.product",
-        "article.product",
-        "div.product",
-        "li.product",
-        "[data-testid='product-card']",
-    ]
-    for sel in candidates:
-        cards = soup.select(sel)
-        if cards:
-            return cards
     cards = []
     for cont in soup.find_all(["div", "article", "li"]):
         title = cont.select_one(".product-title") or cont.find(
             ["h2", "h3", "h4"], string=True
         )
         price = cont.select_one(".product-price") or cont.find(
-            ["span", "p"], string=re.compile(r"\$\s*\d")
+            ["span", "p"], string=PRICE_RE
         )
         if title and price:
             cards.append(cont)
     return cards
 
 
+def _card_signature(cards: List[Tag]) -> str | None:
+    """
+    Turunkan selector "tag.kelas" dari hasil scan. Hanya card terdalam
+    (yang tidak membungkus card lain) yang dihitung, dan semuanya harus
+    punya tag dan kelas yang sama; jika tidak, tidak ada yang dipelajari.
+    """
+    card_ids = {id(c) for c in cards}
+    wrappers = {id(p) for c in cards for p in c.parents if id(p) in card_ids}
+    innermost = [c for c in cards if id(c) not in wrappers]
+    signatures = {(c.name, tuple(c.get("class") or ())) for c in innermost}
+    if len(signatures) != 1:
+        return None
+    name, classes = signatures.pop()
+    if not classes:
+        return None
+    return name + "".join(f".{c}" for c in classes)
+
+
+def _find_cards(
+    soup: BeautifulSoup, memo: SelectorMemo | None = None, key: str = BASE_URL
+) -> List[Tag]:
+    """
+    Mengembalikan list elemen card produk.
+    Selector sengaja fleksibel karena struktur situs bisa berbeda.
+    Jika memo diberikan, selector yang terakhir berhasil untuk `key` dicoba
+    lebih dulu, dan selector hasil scan disimpan agar halaman berikutnya
+    cukup satu query selector.
+    """
+    learned = memo.get(key) if memo else None
+    if learned:
+        cards = soup.select(learned)
+        if cards:
+            return cards
+        logging.info(f"Selector '{learned}' tidak cocok lagi, mencari ulang.")
+        memo.forget(key)
+
+    for sel in CARD_SELECTORS:
+        if sel == learned:
+            continue
+        cards = soup.select(sel)
+        if cards:
+            if memo:
+                memo.set(key, sel)
+            return cards
+
+    cards = _scan_cards(soup)
+    if memo and cards:
+        signature = _card_signature(cards)
+        if signature:
+            memo.set(key, signature)
+            return soup.select(signature)
+    return cards
+
+
 def _text(el: Tag | None) -> str:
     return el.get_text(strip=True) if el else ""
 
@@ -94,106 +320,404 @@ def _text(el: Tag | None) -> str:
 def _extract_with_patterns(container: Tag) -> Dict[str, str]:
     """
     Ekstraksi field dengan beberapa pola umum agar robust.
+    Subtree card hanya ditelusuri sekali: elemen pertama untuk setiap kelas
+    field, heading pertama, dan teks pertama yang cocok dengan setiap pola
+    dicatat dalam satu pass, lalu digabung dengan prioritas yang sama seperti
+    select_one(kelas) lalu find(pola).
     """
-    title = (
-        _text(container.select_one(".product-title"))
-        or _text(container.find(["h2", "h3", "h4"]))
-    )
+    found: Dict[str, Tag | NavigableString] = {}
+    for el in container.descendants:
+        if isinstance(el, Tag):
+            for cls in el.get("class") or ():
+                if cls in FIELD_CLASSES and cls not in found:
+                    found[cls] = el
+            if el.name in HEADING_TAGS and "heading" not in found:
+                found["heading"] = el
+        elif isinstance(el, NavigableString):
+            for key, pattern in STRING_PATTERNS:
+                if key not in found and pattern.search(el):
+                    found[key] = el
+
+    def _first(*keys: str) -> str:
+        for key in keys:
+            text = _text(found.get(key))
+            if text:
+                return text
+        return ""
 
-    price = (
-        _text(container.select_one(".product-price"))
-        or _text(container.find(string=re.compile(r"\$\s*\d")))
-    )
+    return {
+        "Title": _first("product-title", "heading"),
+        "Price": _first("product-price", "price"),
+        "Rating": _first("product-rating", "rating", "rating_number"),
+        "Colors": _first("product-colors", "colors"),
+        "Size": _first("product-size", "size"),
+        "Gender": _first("product-gender", "gender"),
+    }
 
-    rating = (
-        _text(container.select_one(".product-rating"))
-        or _text(container.find(string=re.compile(r"\d+(\.\d+)?\s*/\s*5")))
-        or _text(container.find(string=re.compile(r"^\d+(\.\d+)?$")))
-    )
 
-    colors = (
-        _text(container.select_one(".product-colors"))
-        or _text(container.find(string=re.compile(r"Colors?", re.I)))
-    )
+class _HintMemo:
+    """
+    Memo selector sekali pakai untuk _parse_products: diisi selector hasil
+    belajar dari proses induk dan mencatat selector yang akhirnya dipakai,
+    supaya parsing bisa berjalan di proses lain tanpa berbagi SelectorMemo.
+    """
 
-    size = (
-        _text(container.select_one(".product-size"))
-        or _text(container.find(string=re.compile(r"Size", re.I)))
-    )
+    __slots__ = ("selector",)
 
-    gender = (
-        _text(container.select_one(".product-gender"))
-        or _text(container.find(string=re.compile(r"Gender", re.I)))
-    )
+    def __init__(self, selector: Optional[str]):
+        self.selector = selector
 
-    return {
-        "Title": title,
-        "Price": price,
-        "Rating": rating,
-        "Colors": colors,
-        "Size": size,
-        "Gender": gender,
-    }
+    def get(self, key: str) -> Optional[str]:
+        return self.selector
+
+    def set(self, key: str, selector: str) -> None:
+        self.selector = selector
+
+    def forget(self, key: str) -> None:
+        self.selector = None
 
 
-def scrape_page(page: int, session: requests.Session | None = None) -> List[ProductRaw]:
+def _parse_products(
+    html: str,
+    parser: str = DEFAULT_PARSER,
+    selector_hint: Optional[str] = None,
+    key: str = BASE_URL,
+) -> Tuple[List[Tuple[str, ...]], Optional[str]]:
     """
-    Scrap satu halaman. Mengembalikan list ProductRaw.
+    Parse satu halaman HTML menjadi tuple (Title, Price, Rating, Colors,
+    Size, Gender) per produk. Fungsi level-modul tanpa state bersama agar
+    bisa dikirim ke ProcessPoolExecutor; selector_hint adalah selector card
+    yang sudah dipelajari, dan selector yang akhirnya cocok dikembalikan.
     """
-    if not session:
-        session = _requests_session()
+    soup = _make_soup(html, parser)
+    hint = _HintMemo(selector_hint)
+    records: List[Tuple[str, ...]] = []
+    for c in _find_cards(soup, hint, key):
+        try:
+            fields = _extract_with_patterns(c)
+        except Exception as e:
+            logging.warning(f"Gagal parsing 1 produk: {e}")
+            continue
+        if not fields.get("Title") or not fields.get("Price"):
+            continue
+        records.append((
+            fields["Title"],
+            fields["Price"],
+            fields.get("Rating", ""),
+            fields.get("Colors", ""),
+            fields.get("Size", ""),
+            fields.get("Gender", ""),
+        ))
+    return records, hint.selector
+
+
+def _build_products(
+    page: int,
+    html: str,
+    ts: str,
+    parser: str,
+    memo: SelectorMemo | None,
+    base_url: str,
+    parse_pool: Executor | None,
+) -> List[ProductRaw]:
+    """
+    Parse html (lokal atau lewat parse_pool), perbarui memo selector, dan
+    bangun ProductRaw dengan Timestamp ts.
+    """
+    parse_start = time.perf_counter()
+    hint = memo.get(base_url) if memo else None
+    if parse_pool is not None:
+        records, learned = parse_pool.submit(_parse_products, html, parser, hint, base_url).result()
+    else:
+        records, learned = _parse_products(html, parser, hint, base_url)
+    if memo and learned != hint:
+        if learned:
+            memo.set(base_url, learned)
+        else:
+            memo.forget(base_url)
+    results = [ProductRaw(*record, ts) for record in records]
+    REGISTRY.observe("etl_parse_seconds", time.perf_counter() - parse_start, parser=parser)
+    REGISTRY.inc("etl_pages_total", result="parsed")
+    logging.info(f"Page {page}: {len(results)} produk terambil")
+    return results
 
+
+def scrape_page(
+    page: int,
+    session: requests.Session | None = None,
+    cache: PageCache | None = None,
+    parser: str = DEFAULT_PARSER,
+    memo: SelectorMemo | None = None,
+    throttle: AdaptiveThrottle | None = None,
+    base_url: str = BASE_URL,
+    parse_pool: Executor | None = None,
+    archive: PageArchive | None = None,
+    replay: bool = False,
+    replay_as_of: datetime | str | None = None,
+) -> List[ProductRaw]:
+    """
+    Scrap satu halaman. Mengembalikan list ProductRaw.
+    Jika cache diberikan, request dikirim sebagai conditional GET; bila
+    server menjawab 304, produk dari run sebelumnya dipakai ulang tanpa parsing.
+    parser memilih backend HTML ("auto", "lxml", "html.parser").
+    memo (SelectorMemo) mengingat selector card supaya scan penuh tidak diulang.
+    throttle (AdaptiveThrottle) mengatur laju request secara adaptif.
+    base_url bisa diganti, misal ke server sintetis untuk benchmark.
+    parse_pool (misal ProcessPoolExecutor) menjalankan parsing HTML di
+    executor tersebut, sementara thread ini hanya mengurus network I/O.
+    archive (PageArchive) menyimpan setiap halaman yang diambil; dengan
+    replay=True halaman dibaca dari arsip tersebut tanpa request ke network
+    dan Timestamp produk memakai waktu pengambilan aslinya. replay_as_of
+    (datetime atau timestamp ISO) memutar ulang versi halaman terbaru sampai waktu itu;
+    tanpa replay_as_of yang dipakai versi terakhir.
+    """
     if page == 1:
-        url = f"{BASE_URL}/"
+        url = f"{base_url}/"
     else:
-        url = f"{BASE_URL}/page{page}"
+        url = f"{base_url}/page{page}"
 
-    logging.info(f"Mengambil data dari URL: {url}")
-    html = _fetch_html(url, session)
-    soup = BeautifulSoup(html, "html.parser")
+    if replay:
+        record = archive.get(url, replay_as_of) if archive is not None else None
+        if record is None:
+            suffix = f" sampai {replay_as_of}" if replay_as_of else ""
+            raise LookupError(f"Halaman {url} tidak ada di arsip{suffix}")
+        logging.info(f"Membaca data dari arsip: {url}")
+        return _build_products(page, record["body"], record["timestamp"], parser, memo, base_url, parse_pool)
 
-    cards = _find_cards(soup)
-    results: List[ProductRaw] = []
-    ts = datetime.now().isoformat()
+    if not session:
+        session = _requests_session()
 
-    for c in cards:
-        try:
-            fields = _extract_with_patterns(c)
-            if not fields.get("Title") or not fields.get("Price"):
-                continue
-            prod = ProductRaw(
-                Title=fields["Title"],
-                Price=fields["Price"],
-                Rating=fields.get("Rating", ""),
-                Colors=fields.get("Colors", ""),
-                Size=fields.get("Size", ""),
-                Gender=fields.get("Gender", ""),
-                Timestamp=ts,
-            )
-            results.append(prod)
-        except Exception as e:
-            logging.warning(f"Gagal parsing 1 produk di page {page}: {e}")
-            continue
+    logging.info(f"Mengambil data dari URL: {url}")
+    entry = cache.get(url) if cache else None
+    resp = _get(url, session, PageCache.conditional_headers(entry), throttle)
+    ts = datetime.now().isoformat()
 
-    logging.info(f"Page {page}: {len(results)} produk terambil")
+    not_modified = entry is not None and resp.status_code == 304
+    if archive is not None and not not_modified:
+        archive.append(url, resp.text, resp.headers, resp.status_code, ts)
+    if not_modified and entry.get("rows") is not None:
+        results = [ProductRaw(**row, Timestamp=ts) for row in entry["rows"]]
+        logging.info(f"Page {page}: tidak berubah, {len(results)} produk dari cache")
+        REGISTRY.inc("etl_pages_total", result="not_modified")
+        return results
+
+    html = entry["body"] if not_modified else resp.text
+    results = _build_products(page, html, ts, parser, memo, base_url, parse_pool)
+
+    if cache:
+        etag = resp.headers.get("ETag") or (entry or {}).get("etag")
+        last_modified = resp.headers.get("Last-Modified") or (entry or {}).get("last_modified")
+        rows = [p.to_row() for p in results]
+        for row in rows:
+            del row["Timestamp"]
+        cache.put(url, html, etag, last_modified, rows)
     return results
 
 
-def extract_all(pages: int = TOTAL_PAGES) -> List[Dict[str, str]]:
+def _scrape_page_safe(page: int, session: requests.Session, **kwargs) -> List[ProductRaw] | None:
     """
-    Scrap semua halaman 1..pages dan kembalikan list of dict.
+    Versi scrape_page yang tidak melempar error: halaman gagal -> None.
     """
-    session = _requests_session()
-    all_items: List[Dict[str, str]] = []
-    for p in range(1, pages + 1):
-        try:
-            items = scrape_page(p, session)
-            all_items.extend([asdict(i) for i in items])
-        except Exception as e:
-            logging.error(f"Lewati page {p} karena error: {e}")
-            continue
+    try:
+        return scrape_page(page, session, **kwargs)
+    except Exception as e:
+        logging.error(f"Lewati page {page} karena error: {e}")
+        REGISTRY.inc("etl_pages_total", result="failed")
+        return None
+
+
+def _page_task(
+    page: int,
+    session: requests.Session,
+    checkpoint: CheckpointStore | None = None,
+    resume: bool = False,
+    **scrape_kwargs,
+) -> List[Dict[str, str]] | None:
+    """
+    Ambil satu halaman sebagai list of dict. Dengan checkpoint, hasil
+    disimpan (atau halaman dicatat gagal); dengan resume, halaman yang
+    sudah ada di checkpoint dibaca dari disk tanpa request.
+    """
+    if checkpoint and resume:
+        rows = checkpoint.load_page(page)
+        if rows is not None:
+            logging.info(f"Page {page}: {len(rows)} produk dari checkpoint")
+            return rows
+
+    items = _scrape_page_safe(page, session, **scrape_kwargs)
+    if items is None:
+        if checkpoint:
+            checkpoint.mark_failed(page)
+        return None
+
+    rows = [i.to_row() for i in items]
+    if checkpoint:
+        checkpoint.save_page(page, rows)
+    return rows
+
+
+def create_parse_pool(parse_workers: int) -> ProcessPoolExecutor | None:
+    """
+    ProcessPoolExecutor untuk parsing HTML, atau None bila parse_workers <= 0.
+    Proses worker dibuat lewat forkserver (spawn bila tidak tersedia), bukan
+    fork: pool dipakai dari thread fetch, dan fork dari proses yang punya
+    banyak thread bisa mewarisi lock (logging, REGISTRY) yang sedang dipegang.
+    """
+    if parse_workers <= 0:
+        return None
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return ProcessPoolExecutor(max_workers=parse_workers, mp_context=multiprocessing.get_context(method))
+
+
+def iter_pages(
+    pages: int = TOTAL_PAGES,
+    max_workers: int = 1,
+    cache: PageCache | None = None,
+    parser: str = DEFAULT_PARSER,
+    memo: SelectorMemo | None = None,
+    checkpoint: CheckpointStore | None = None,
+    resume: bool = False,
+    throttle: AdaptiveThrottle | None = None,
+    base_url: str = BASE_URL,
+    parse_workers: int = 0,
+    archive: PageArchive | None = None,
+    replay: bool = False,
+    replay_as_of: datetime | str | None = None,
+    parse_pool: Executor | None = None,
+) -> Iterator[List[Dict[str, str]]]:
+    """
+    Generator yang menghasilkan produk per halaman (list of dict) sesuai
+    urutan halaman. Paling banyak max_workers halaman diambil/ditahan
+    sekaligus, jadi memori tetap kecil walaupun jumlah halaman besar.
+    Halaman yang gagal atau kosong dilewati.
+    checkpoint menyimpan progres per halaman; resume=True memakai ulang
+    halaman yang sudah tersimpan dan hanya mengambil yang belum/gagal,
+    sedangkan resume=False mengosongkan checkpoint lama lebih dulu.
+    throttle (AdaptiveThrottle) dipakai bersama semua worker untuk
+    menyesuaikan laju request dengan kemampuan server.
+    base_url: alamat situs sumber (default fashion-studio).
+    parse_workers > 0 memindahkan parsing HTML ke ProcessPoolExecutor
+    berisi sekian proses, sehingga parsing yang CPU-bound tidak lagi
+    dibatasi GIL; thread max_workers tetap mengurus network I/O.
+    parse_pool: executor parsing milik pemanggil (lihat create_parse_pool);
+    bila diberikan, parse_workers diabaikan dan pool tidak ditutup di sini.
+    archive/replay/replay_as_of: lihat scrape_page; replay membaca halaman
+    dari arsip sehingga pemrosesan ulang berjalan secepat disk.
+    """
+    if replay_as_of is not None:
+        # Diparse sekali di sini: nilai yang salah langsung gagal, bukan
+        # dilewati diam-diam per halaman oleh _scrape_page_safe.
+        replay_as_of = parse_as_of(replay_as_of)
+    if checkpoint and not resume:
+        checkpoint.clear()
+
+    max_workers = max(1, min(max_workers, pages)) if pages > 0 else 1
+    session = _requests_session(pool_size=max_workers, retry_statuses=throttle is None)
+    page_numbers = iter(range(1, pages + 1))
+    task_kwargs = {
+        "checkpoint": checkpoint,
+        "resume": resume,
+        "cache": cache,
+        "parser": parser,
+        "memo": memo,
+        "throttle": throttle,
+        "base_url": base_url,
+        "archive": archive,
+        "replay": replay,
+        "replay_as_of": replay_as_of,
+    }
+
+    own_pool = create_parse_pool(parse_workers) if parse_pool is None else None
+    task_kwargs["parse_pool"] = parse_pool or own_pool
+    try:
+        if max_workers == 1:
+            # Tanpa thread pool: halaman diproses di thread pemanggil, jadi
+            # cProfile (mode profiling) ikut melihat kerja extract.
+            for p in page_numbers:
+                rows = _page_task(p, session, **task_kwargs)
+                if rows:
+                    yield rows
+        else:
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                pending = deque(
+                    pool.submit(_page_task, p, session, **task_kwargs)
+                    for p in islice(page_numbers, max_workers)
+                )
+                while pending:
+                    rows = pending.popleft().result()
+                    next_page = next(page_numbers, None)
+                    if next_page is not None:
+                        pending.append(pool.submit(_page_task, next_page, session, **task_kwargs))
+                    if rows:
+                        yield rows
+    finally:
+        if own_pool is not None:
+            own_pool.shutdown(cancel_futures=True)
+
+    if checkpoint:
+        failed = sorted(p for p in checkpoint.failed_pages() if p <= pages)
+        if failed:
+            logging.warning(f"Halaman gagal (ulangi dengan resume): {failed}")
+    if throttle:
+        logging.info(f"Laju request akhir: {throttle.rate:.2f} req/s")
+
+
+def extract_all(
+    pages: int = TOTAL_PAGES,
+    max_workers: int = 1,
+    cache: PageCache | None = None,
+    parser: str = DEFAULT_PARSER,
+    memo: SelectorMemo | None = None,
+    checkpoint: CheckpointStore | None = None,
+    resume: bool = False,
+    throttle: AdaptiveThrottle | None = None,
+    base_url: str = BASE_URL,
+    parse_workers: int = 0,
+    archive: PageArchive | None = None,
+    replay: bool = False,
+    replay_as_of: datetime | str | None = None,
+    as_columns: bool = False,
+) -> List[Dict[str, str]] | ProductColumns:
+    """
+    Scrap semua halaman 1..pages dan kembalikan list of dict, atau
+    ProductColumns (per kolom, lebih hemat memori) bila as_columns=True.
+    max_workers > 1 mengambil beberapa halaman sekaligus (maksimal
+    max_workers request berjalan bersamaan); urutan hasil tetap sesuai
+    nomor halaman dan halaman yang gagal tetap dilewati.
+    cache (PageCache) mengaktifkan conditional GET dan pemakaian ulang hasil parsing.
+    checkpoint/resume/throttle/base_url/parse_workers/archive/replay/
+    replay_as_of: lihat iter_pages.
+    """
+    all_items: List[Dict[str, str]] | ProductColumns = ProductColumns() if as_columns else []
+    for batch in iter_pages(
+        pages,
+        max_workers,
+        cache=cache,
+        parser=parser,
+        memo=memo,
+        checkpoint=checkpoint,
+        resume=resume,
+        throttle=throttle,
+        base_url=base_url,
+        parse_workers=parse_workers,
+        archive=archive,
+        replay=replay,
+        replay_as_of=replay_as_of,
+    ):
+        all_items.extend(batch)
     logging.info(f"Total produk terambil: {len(all_items)}")
     return all_items
 
 
-__all__ = ["extract_all", "scrape_page", "ProductRaw"]
\ No newline at end of file
+__all__ = [
+    "extract_all",
+    "iter_pages",
+    "scrape_page",
+    "create_parse_pool",
+    "ProductRaw",
+    "ProductColumns",
+    "PRODUCT_FIELDS",
+    "MAX_WORKERS",
+    "PARSERS",
+    "DEFAULT_PARSER",
+]
\ No newline at end of file
@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+import numpy as np
+
+logging.basicConfig(level=logging.INFO, format="%(levelname)s - %(message)s")
+
+FINGERPRINT_DB = os.path.join(".cache", "fingerprints.sqlite")
+BLOOM_BITS = 1 << 23
+BLOOM_HASHES = 4
+_SQL_BATCH = 500
+_BLOOM_LOAD_BATCH = 100_000
+
+
+class BloomFilter:
+    """
+    Bloom filter di atas array bit numpy untuk fingerprint 64-bit yang sudah
+    berupa hash; posisi bit diturunkan dengan double hashing dari fingerprint.
+    """
+
+    def __init__(self, bits: int = BLOOM_BITS, hashes: int = BLOOM_HASHES):
+        self.bits = bits
+        self.hashes = hashes
+        self._array = np.zeros((bits + 7) // 8, dtype=np.uint8)
+
+    def _positions(self, fingerprints: np.ndarray) -> np.ndarray:
+        fps = fingerprints.astype(np.uint64, copy=False)
+        h1 = fps & np.uint64(0xFFFFFFFF)
+        h2 = (fps >> np.uint64(32)) | np.uint64(1)
+        i = np.arange(self.hashes, dtype=np.uint64)[:, None]
+        return ((h1 + i * h2) % np.uint64(self.bits)).astype(np.int64)
+
+    def add(self, fingerprints: np.ndarray) -> None:
+        pos = self._positions(fingerprints).ravel()
+        np.bitwise_or.at(self._array, pos >> 3, (1 << (pos & 7)).astype(np.uint8))
+
+    def might_contain(self, fingerprints: np.ndarray) -> np.ndarray:
+        pos = self._positions(fingerprints)
+        hit = (self._array[pos >> 3] >> (pos & 7).astype(np.uint8)) & 1
+        return hit.all(axis=0)
+
+
+class FingerprintIndex:
+    """
+    Indeks fingerprint produk yang sudah pernah dimuat, disimpan di SQLite
+    sehingga bertahan antar run. transform(seen_index=...) membuang produk
+    yang fingerprint-nya sudah ada, jadi produk yang tidak berubah tidak
+    dimuat ulang ke sink.
+    - Fingerprint baru ditandai lewat add() sebagai pending dan baru disimpan
+      saat commit(), yaitu setelah semua load berhasil; bila load gagal,
+      rollback() membuangnya supaya produk tersebut dicoba lagi run berikutnya.
+    - max_age_days membuat entri yang first_seen-nya lebih tua kedaluwarsa,
+      sehingga produk lama dimuat ulang secara berkala.
+    - bloom=True memuat Bloom filter di memori agar fingerprint yang pasti
+      baru tidak perlu dicek ke SQLite.
+    Fingerprint dihitung dari hash pandas, jadi indeks sebaiknya dibuat ulang
+    bila versi pandas berganti.
+    """
+
+    def __init__(
+        self,
+        path: str = FINGERPRINT_DB,
+        max_age_days: Optional[float] = None,
+        bloom: bool = False,
+        bloom_bits: int = BLOOM_BITS,
+        clock=time.time,
+    ):
+        self.path = path
+        self.max_age_days = max_age_days
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._pending: list[np.ndarray] = []
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS fingerprints (fp INTEGER PRIMARY KEY, first_seen REAL NOT NULL)"
+        )
+        self._conn.commit()
+        self.expire()
+        self._bloom = BloomFilter(bloom_bits) if bloom else None
+        if self._bloom is not None:
+            self._load_bloom()
+
+    def _load_bloom(self) -> None:
+        """
+        Isi Bloom filter dari SQLite per _BLOOM_LOAD_BATCH baris, satu
+        panggilan add() per batch.
+        """
+        cur = self._conn.execute("SELECT fp FROM fingerprints")
+        while True:
+            rows = cur.fetchmany(_BLOOM_LOAD_BATCH)
+            if not rows:
+                break
+            keys = np.fromiter((fp for (fp,) in rows), dtype=np.int64, count=len(rows))
+            self._bloom.add(keys.view(np.uint64))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM fingerprints").fetchone()[0]
+
+    def expire(self) -> int:
+        """
+        Hapus entri yang lebih tua dari max_age_days. Mengembalikan jumlahnya.
+        """
+        if not self.max_age_days:
+            return 0
+        cutoff = self._clock() - self.max_age_days * 86400
+        with self._lock:
+            cur = self._conn.execute("DELETE FROM fingerprints WHERE first_seen < ?", (cutoff,))
+            self._conn.commit()
+        if cur.rowcount:
+            logging.info(f"Indeks fingerprint: {cur.rowcount} entri kedaluwarsa dihapus")
+        return cur.rowcount
+
+    def contains(self, fingerprints: np.ndarray) -> np.ndarray:
+        """
+        Mask boolean: True bila fingerprint sudah tersimpan (tidak termasuk pending).
+        """
+        fps = np.asarray(fingerprints, dtype=np.uint64)
+        seen = np.zeros(len(fps), dtype=bool)
+        candidates = np.arange(len(fps))
+        if self._bloom is not None:
+            candidates = candidates[self._bloom.might_contain(fps)]
+        keys = fps.view(np.int64)
+        found = set()
+        with self._lock:
+            for start in range(0, len(candidates), _SQL_BATCH):
+                batch = [int(k) for k in keys[candidates[start : start + _SQL_BATCH]]]
+                placeholders = ",".join("?" * len(batch))
+                found.update(
+                    fp for (fp,) in self._conn.execute(
+                        f"SELECT fp FROM fingerprints WHERE fp IN ({placeholders})", batch
+                    )
+                )
+        if found:
+            seen[candidates] = np.fromiter((int(keys[i]) in found for i in candidates), dtype=bool, count=len(candidates))
+        return seen
+
+    def add(self, fingerprints: np.ndarray) -> None:
+        """
+        Tandai fingerprint sebagai pending; disimpan saat commit().
+        """
+        with self._lock:
+            self._pending.append(np.asarray(fingerprints, dtype=np.uint64))
+
+    def commit(self) -> int:
+        with self._lock:
+            if not self._pending:
+                return 0
+            fps = np.unique(np.concatenate(self._pending))
+            self._pending.clear()
+            now = self._clock()
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO fingerprints (fp, first_seen) VALUES (?, ?)",
+                ((int(k), now) for k in fps.view(np.int64)),
+            )
+            self._conn.commit()
+            if self._bloom is not None:
+                self._bloom.add(fps)
+        logging.info(f"Indeks fingerprint: {len(fps)} fingerprint baru disimpan")
+        return len(fps)
+
+    def rollback(self) -> None:
+        with self._lock:
+            self._pending.clear()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+__all__ = ["FingerprintIndex", "BloomFilter", "FINGERPRINT_DB"]
@@ -1,64 +1,293 @@
 from __future__ import annotations
 
+import gzip
+import io
 import logging
 import os
-from typing import Optional
+import time
+from itertools import chain
+from typing import TYPE_CHECKING, Any, Iterable, List, Optional, Tuple
 
 import pandas as pd
 
-import gspread
-from oauth2client.service_account import ServiceAccountCredentials
-import psycopg2
+if TYPE_CHECKING:
+    import gspread
+
+# gspread, oauth2client, psycopg2 dan pyarrow diimpor di dalam fungsi
+# sink masing-masing, supaya run yang hanya menulis CSV tidak ikut
+# memuat dependensi sink lain.
 
 logging.basicConfig(level=logging.INFO, format="%(levelname)s - %(message)s")
 
+GSHEETS_MAX_CELLS_PER_REQUEST = 40_000
+GSHEETS_WRITE_INTERVAL = 1.0
+GSHEETS_MAX_RETRIES = 5
+
+PG_COLUMNS = ["Title", "Price", "Rating", "Colors", "Size", "Gender", "Timestamp"]
+PG_TEXT_COLUMNS = ["Title", "Size", "Gender"]
+PG_LOAD_METHODS = ("copy", "values")
+PG_BATCH_SIZE = 10_000
+PG_LOAD_MODES = ("append", "upsert")
+PG_FINGERPRINT_SQL = "md5(concat_ws('|', Title, Size, Gender, Colors::text))"
+
 
-def load_to_csv(df: pd.DataFrame, filename: str = "products.csv", directory: Optional[str] = None) -> str:
+def load_to_csv(
+    df: pd.DataFrame,
+    filename: str = "products.csv",
+    directory: Optional[str] = None,
+    compression: Optional[str] = None,
+    mode: str = "snapshot",
+) -> str:
     """
     Simpan DataFrame ke CSV. Mengembalikan path file.
+    mode "snapshot" (default) menulis ke file sementara lalu di-rename, jadi
+    products.csv lama tetap utuh bila proses gagal di tengah; mode "append"
+    menambahkan baris ke file yang ada (lihat CsvStreamWriter).
+    compression="gzip" (atau nama file berakhiran .gz) menyimpan CSV terkompresi.
     """
     if df is None or df.empty:
         raise ValueError("DataFrame kosong. Pastikan tahap extract & transform menghasilkan data.")
 
-    path = os.path.join(directory, filename) if directory else filename
-
+    writer = CsvStreamWriter(filename, directory, mode=mode, compression=compression)
     try:
-        os.makedirs(os.path.dirname(path), exist_ok=True) if os.path.dirname(path) else None
-        df.to_csv(path, index=False, encoding="utf-8")
-        logging.info(f"[CSV] Data berhasil disimpan ke {path}")
-        return path
+        writer.write(df)
+        writer.close()
+        logging.info(f"[CSV] Data berhasil disimpan ke {writer.path}")
+        return writer.path
     except PermissionError as e:
-        logging.error(f"Izin ditolak saat menyimpan ke '{path}': {e}")
+        writer.abort()
+        logging.error(f"Izin ditolak saat menyimpan ke '{writer.path}': {e}")
+        raise
+    except OSError as e:
+        writer.abort()
+        logging.error(f"Gagal menulis file '{writer.path}': {e}")
         raise
+
+
+def _gsheets_client() -> gspread.Client:
+    import gspread
+    from oauth2client.service_account import ServiceAccountCredentials
+
+    scope = ["https://spreadsheets.google.com/feeds",
+            "https://www.googleapis.com/auth/drive"]
+    creds = ServiceAccountCredentials.from_json_keyfile_name("google-sheets-api.json", scope)
+    return gspread.authorize(creds)
+
+
+def _df_for_gsheets(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Salinan DataFrame dengan Timestamp diubah ke string ISO agar bisa dikirim ke API.
+    """
+    df_for_gsheets = df.copy()
+    if 'Timestamp' in df_for_gsheets.columns:
+        df_for_gsheets['Timestamp'] = df_for_gsheets['Timestamp'].dt.strftime('%Y-%m-%dT%H:%M:%S.%f')
+    return df_for_gsheets
+
+
+def _cell_equal(old: Any, new: Any) -> bool:
+    """
+    Bandingkan nilai sel lama (dari Sheets) dengan nilai baru; angka
+    dibandingkan sebagai angka karena Sheets bisa mengembalikan 160000
+    untuk 160000.0.
+    """
+    if old == new:
+        return True
+    try:
+        return float(old) == float(new)
+    except (TypeError, ValueError):
+        return str(old) == str(new)
+
+
+def _changed_row_ranges(
+    old_rows: List[List[Any]], new_rows: Iterable[Iterable[Any]], width: int
+) -> List[Tuple[int, List[List[Any]]]]:
+    """
+    Bandingkan isi sheet lama dengan baris baru dan kembalikan blok baris
+    berurutan yang berubah sebagai (indeks baris awal 0-based, nilai).
+    Baris lama yang sudah tidak ada di data baru dikosongkan.
+    """
+    blocks: List[Tuple[int, List[List[Any]]]] = []
+    current: List[List[Any]] = []
+    start = 0
+
+    def _pad(row: Iterable[Any]) -> List[Any]:
+        row = list(row)
+        return row + [""] * (width - len(row))
+
+    n_new = 0
+    for i, row in enumerate(new_rows):
+        n_new = i + 1
+        padded = _pad(row)
+        old = _pad(old_rows[i]) if i < len(old_rows) else [""] * width
+        if all(_cell_equal(o, n) for o, n in zip(old, padded)):
+            if current:
+                blocks.append((start, current))
+                current = []
+            continue
+        if not current:
+            start = i
+        current.append(padded)
+
+    for i in range(n_new, len(old_rows)):
+        if all(cell == "" for cell in old_rows[i]):
+            if current:
+                blocks.append((start, current))
+                current = []
+            continue
+        if not current:
+            start = i
+        current.append([""] * width)
+
+    if current:
+        blocks.append((start, current))
+    return blocks
+
+
+def _batch_requests(
+    blocks: List[Tuple[int, List[List[Any]]]], width: int, max_cells: int
+) -> List[List[dict]]:
+    """
+    Pecah blok perubahan menjadi beberapa payload batch_update yang
+    masing-masing berisi paling banyak max_cells sel.
+    """
+    from gspread.utils import rowcol_to_a1
+
+    rows_per_range = max(1, max_cells // width)
+    requests_: List[List[dict]] = []
+    current: List[dict] = []
+    cells = 0
+    for start, values in blocks:
+        for offset in range(0, len(values), rows_per_range):
+            part = values[offset:offset + rows_per_range]
+            part_cells = len(part) * width
+            if current and cells + part_cells > max_cells:
+                requests_.append(current)
+                current, cells = [], 0
+            first_row = start + offset + 1
+            current.append(
+                {
+                    "range": f"{rowcol_to_a1(first_row, 1)}:{rowcol_to_a1(first_row + len(part) - 1, width)}",
+                    "values": part,
+                }
+            )
+            cells += part_cells
+    if current:
+        requests_.append(current)
+    return requests_
+
+
+def _paced_batch_update(sheet, payloads: List[List[dict]], interval: float) -> None:
+    """
+    Kirim payload batch_update satu per satu dengan jeda `interval` detik
+    dan backoff eksponensial bila kuota API habis (HTTP 429).
+    """
+    import gspread
+
+    for n, payload in enumerate(payloads):
+        if n:
+            time.sleep(interval)
+        for attempt in range(GSHEETS_MAX_RETRIES + 1):
+            try:
+                sheet.batch_update(payload)
+                break
+            except gspread.exceptions.APIError as e:
+                if e.code != 429 or attempt == GSHEETS_MAX_RETRIES:
+                    raise
+                wait = interval * 2 ** (attempt + 1)
+                logging.warning(f"[Google Sheets] Kuota habis, mencoba lagi dalam {wait:.1f} detik.")
+                time.sleep(wait)
+
+
+def load_to_parquet(
+    df: pd.DataFrame, directory: str = "products_parquet", compression: str = "zstd"
+) -> str:
+    """
+    Simpan DataFrame sebagai dataset Parquet terkompresi yang dipartisi per
+    tanggal scrape (folder scrape_date=YYYY-MM-DD). Menjalankan ulang pada
+    tanggal yang sama mengganti partisi tanggal itu saja. Mengembalikan path folder.
+    """
+    if df is None or df.empty:
+        raise ValueError("DataFrame kosong. Tidak bisa disimpan ke Parquet.")
+
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("Library 'pyarrow' dibutuhkan untuk menyimpan ke Parquet.") from e
+
+    try:
+        data = df.assign(scrape_date=df["Timestamp"].dt.strftime("%Y-%m-%d"))
+        table = pa.Table.from_pandas(data, preserve_index=False)
+        pq.write_to_dataset(
+            table,
+            root_path=directory,
+            partition_cols=["scrape_date"],
+            compression=compression,
+            existing_data_behavior="delete_matching",
+        )
+        logging.info(f"[Parquet] Data berhasil disimpan ke {directory}")
+        return directory
     except OSError as e:
-        logging.error(f"Gagal menulis file '{path}': {e}")
+        logging.error(f"Gagal menulis dataset Parquet '{directory}': {e}")
         raise
 
 
-def load_to_gsheets(df: pd.DataFrame, spreadsheet_id: str) -> None:
+def read_parquet_snapshots(
+    directory: str = "products_parquet",
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+) -> pd.DataFrame:
+    """
+    Baca snapshot Parquet untuk rentang tanggal scrape (YYYY-MM-DD, inklusif).
+    Filter diterapkan pada partisi sehingga folder di luar rentang tidak dibaca.
+    """
+    filters = []
+    if start_date:
+        filters.append(("scrape_date", ">=", start_date))
+    if end_date:
+        filters.append(("scrape_date", "<=", end_date))
+    return pd.read_parquet(directory, filters=filters or None)
+
+
+def load_to_gsheets(
+    df: pd.DataFrame,
+    spreadsheet_id: str,
+    max_cells: int = GSHEETS_MAX_CELLS_PER_REQUEST,
+    interval: float = GSHEETS_WRITE_INTERVAL,
+) -> None:
     """
     Simpan DataFrame ke Google Sheets yang sudah ada berdasarkan ID-nya.
+    Isi sheet dibaca sekali, lalu hanya baris yang berubah yang dikirim
+    lewat batch_update (paling banyak max_cells sel per request, dengan
+    jeda interval detik antar request).
     """
+    import gspread
+    from gspread.utils import ValueRenderOption
+
     if df is None or df.empty:
         raise ValueError("DataFrame kosong, tidak bisa disimpan ke Google Sheets.")
 
-    scope = ["https://spreadsheets.google.com/feeds",
-            "https://www.googleapis.com/auth/drive"]
-    creds = ServiceAccountCredentials.from_json_keyfile_name("google-sheets-api.json", scope)
-    client = gspread.authorize(creds)
+    client = _gsheets_client()
 
     try:
         spreadsheet = client.open_by_key(spreadsheet_id)
         sheet = spreadsheet.sheet1
         
-        df_for_gsheets = df.copy()
-        if 'Timestamp' in df_for_gsheets.columns:
-            df_for_gsheets['Timestamp'] = df_for_gsheets['Timestamp'].dt.strftime('%Y-%m-%dT%H:%M:%S.%f')
-        
-        sheet.clear()
-        sheet.update([df_for_gsheets.columns.values.tolist()] + df_for_gsheets.values.tolist())
+        df_for_gsheets = _df_for_gsheets(df)
+        header = df_for_gsheets.columns.values.tolist()
+        new_rows = chain([header], df_for_gsheets.itertuples(index=False, name=None))
+
+        old_rows = sheet.get_all_values(value_render_option=ValueRenderOption.unformatted)
+        width = max([len(header)] + [len(r) for r in old_rows])
+        blocks = _changed_row_ranges(old_rows, new_rows, width)
+        payloads = _batch_requests(blocks, width, max_cells)
+        _paced_batch_update(sheet, payloads, interval)
         
-        logging.info(f"[Google Sheets] Data berhasil disimpan di spreadsheet: {spreadsheet.title}")
+        changed = sum(len(values) for _, values in blocks)
+        logging.info(
+            f"[Google Sheets] {changed} baris diperbarui dalam {len(payloads)} request "
+            f"di spreadsheet: {spreadsheet.title}"
+        )
 
     except gspread.SpreadsheetNotFound:
         logging.error(f"Spreadsheet dengan ID '{spreadsheet_id}' tidak ditemukan.")
@@ -68,9 +297,229 @@ def load_to_gsheets(df: pd.DataFrame, spreadsheet_id: str) -> None:
         raise
 
 
-def load_to_postgres(df: pd.DataFrame, db_config: dict, table_name: str = "etl_data") -> None:
+def _create_table(cur, table_name: str) -> None:
+    create_table_query = f"""
+    CREATE TABLE IF NOT EXISTS {table_name} (
+        id SERIAL PRIMARY KEY,
+        Title TEXT,
+        Price FLOAT,
+        Rating FLOAT,
+        Colors INT,
+        Size TEXT,
+        Gender TEXT,
+        Timestamp TIMESTAMP
+    )
+    """
+    cur.execute(create_table_query)
+
+
+def _copy_rows(cur, df: pd.DataFrame, table_name: str, batch_size: int) -> None:
+    """
+    Kirim data dengan COPY ... FROM STDIN dari buffer CSV di memori,
+    satu COPY per batch_size baris. Kolom teks memakai FORCE_NOT_NULL
+    supaya string kosong tetap tersimpan sebagai '' (bukan NULL), sama
+    seperti metode "values".
+    """
+    copy_query = (
+        f"COPY {table_name} ({', '.join(PG_COLUMNS)}) FROM STDIN "
+        f"WITH (FORMAT csv, FORCE_NOT_NULL ({', '.join(PG_TEXT_COLUMNS)}))"
+    )
+    for start in range(0, len(df), batch_size):
+        buf = io.StringIO()
+        df.iloc[start:start + batch_size][PG_COLUMNS].to_csv(
+            buf, header=False, index=False, date_format="%Y-%m-%d %H:%M:%S.%f"
+        )
+        buf.seek(0)
+        cur.copy_expert(copy_query, buf)
+
+
+def execute_values(cur, sql: str, argslist, **kwargs):
+    """
+    psycopg2.extras.execute_values yang diimpor saat pertama dipakai.
+    """
+    from psycopg2.extras import execute_values as _execute_values
+
+    return _execute_values(cur, sql, argslist, **kwargs)
+
+
+def _values_rows(cur, df: pd.DataFrame, table_name: str, batch_size: int) -> None:
     """
-    Simpan DataFrame ke PostgreSQL.
+    Fallback tanpa COPY: INSERT multi-row lewat execute_values per batch_size baris.
+    """
+    records = zip(
+        df["Title"].astype(object).tolist(),
+        df["Price"].astype(float).tolist(),
+        df["Rating"].astype(float).tolist(),
+        df["Colors"].astype(int).tolist(),
+        df["Size"].astype(object).tolist(),
+        df["Gender"].astype(object).tolist(),
+        df["Timestamp"].tolist(),
+    )
+    execute_values(
+        cur,
+        f"INSERT INTO {table_name} ({', '.join(PG_COLUMNS)}) VALUES %s",
+        list(records),
+        page_size=batch_size,
+    )
+
+
+def _write_rows(
+    cur, df: pd.DataFrame, table_name: str, method: str = "copy", batch_size: int = PG_BATCH_SIZE
+) -> None:
+    """
+    Tulis semua baris df ke tabel. method "copy" memakai COPY; jika server
+    tidak mendukungnya, transaksi dikembalikan ke savepoint dan data
+    dikirim ulang dengan execute_values.
+    """
+    import psycopg2
+
+    if method not in PG_LOAD_METHODS:
+        raise ValueError(f"Metode load '{method}' tidak dikenal. Pilihan: {', '.join(PG_LOAD_METHODS)}")
+    if method == "values":
+        _values_rows(cur, df, table_name, batch_size)
+        return
+
+    cur.execute("SAVEPOINT bulk_load")
+    try:
+        _copy_rows(cur, df, table_name, batch_size)
+    except psycopg2.NotSupportedError as e:
+        logging.warning(f"COPY tidak didukung ({e}), memakai execute_values.")
+        cur.execute("ROLLBACK TO SAVEPOINT bulk_load")
+        _values_rows(cur, df, table_name, batch_size)
+    cur.execute("RELEASE SAVEPOINT bulk_load")
+
+
+def _backfill_fingerprints(cur, table_name: str, dedupe_existing: bool = False) -> None:
+    """
+    Isi fingerprint untuk baris yang dimuat sebelum mode upsert dipakai
+    (fingerprint IS NULL) supaya unique index bisa dibuat dan upsert tidak
+    menyisipkan salinan kedua. Bila baris lama punya duplikat per
+    fingerprint (riwayat harga dari mode append), pemuatan ditolak kecuali
+    dedupe_existing=True: duplikat lalu dihapus dan hanya baris dengan
+    Timestamp terbaru yang disimpan.
+    """
+    cur.execute(f"SELECT EXISTS (SELECT 1 FROM {table_name} WHERE fingerprint IS NULL)")
+    if not cur.fetchone()[0]:
+        return
+    cur.execute(f"SELECT count(*) - count(DISTINCT {PG_FINGERPRINT_SQL}) FROM {table_name}")
+    duplicates = cur.fetchone()[0]
+    if duplicates and not dedupe_existing:
+        raise ValueError(
+            f"Tabel {table_name} berisi {duplicates} baris duplikat dari mode append sehingga upsert "
+            f"tidak bisa dipakai. Jalankan sekali dengan dedupe_existing=True (--pg-dedupe-existing) "
+            f"untuk menghapus duplikat dan hanya menyimpan baris terbaru per produk."
+        )
+    removed = 0
+    if duplicates:
+        cur.execute(
+            f"""
+            DELETE FROM {table_name} WHERE id IN (
+                SELECT id FROM (
+                    SELECT id, row_number() OVER (
+                        PARTITION BY {PG_FINGERPRINT_SQL} ORDER BY Timestamp DESC NULLS LAST, id DESC
+                    ) AS rn
+                    FROM {table_name}
+                ) AS ranked
+                WHERE rn > 1
+            )
+            """
+        )
+        removed = cur.rowcount
+    cur.execute(f"UPDATE {table_name} SET fingerprint = {PG_FINGERPRINT_SQL} WHERE fingerprint IS NULL")
+    logging.info(
+        f"[PostgreSQL] Fingerprint diisi untuk {cur.rowcount} baris lama di tabel {table_name}, "
+        f"{removed} duplikat dihapus"
+    )
+
+
+def _upsert_rows(
+    cur,
+    df: pd.DataFrame,
+    table_name: str,
+    method: str = "copy",
+    batch_size: int = PG_BATCH_SIZE,
+    dedupe_existing: bool = False,
+) -> int:
+    """
+    Muat df ke tabel staging sementara lalu merge ke tabel target dengan
+    INSERT ... ON CONFLICT pada fingerprint produk (Title/Size/Gender/Colors).
+    Produk baru di-insert, produk lama hanya di-update bila Price atau
+    Rating berubah. Baris lama tanpa fingerprint diisi dulu lewat
+    _backfill_fingerprints. Mengembalikan jumlah baris yang benar-benar berubah.
+    """
+    base_name = table_name.split(".")[-1]
+    staging = f"{base_name}_staging"
+
+    cur.execute(f"ALTER TABLE {table_name} ADD COLUMN IF NOT EXISTS fingerprint TEXT")
+    _backfill_fingerprints(cur, table_name, dedupe_existing)
+    cur.execute(
+        f"CREATE UNIQUE INDEX IF NOT EXISTS {base_name}_fingerprint_key ON {table_name} (fingerprint)"
+    )
+    cur.execute(
+        f"""
+        CREATE TEMP TABLE {staging} (
+            Title TEXT,
+            Price FLOAT,
+            Rating FLOAT,
+            Colors INT,
+            Size TEXT,
+            Gender TEXT,
+            Timestamp TIMESTAMP
+        ) ON COMMIT DROP
+        """
+    )
+    _write_rows(cur, df, staging, method, batch_size)
+
+    columns = ", ".join(PG_COLUMNS)
+    cur.execute(
+        f"""
+        INSERT INTO {table_name} AS t ({columns}, fingerprint)
+        SELECT DISTINCT ON (fingerprint) {columns}, fingerprint
+        FROM (SELECT *, {PG_FINGERPRINT_SQL} AS fingerprint FROM {staging}) AS s
+        ORDER BY fingerprint, Timestamp DESC
+        ON CONFLICT (fingerprint) DO UPDATE
+        SET Price = EXCLUDED.Price, Rating = EXCLUDED.Rating, Timestamp = EXCLUDED.Timestamp
+        WHERE (t.Price, t.Rating) IS DISTINCT FROM (EXCLUDED.Price, EXCLUDED.Rating)
+        """
+    )
+    return cur.rowcount
+
+
+def _load_rows(
+    cur,
+    df: pd.DataFrame,
+    table_name: str,
+    mode: str = "append",
+    method: str = "copy",
+    batch_size: int = PG_BATCH_SIZE,
+    dedupe_existing: bool = False,
+) -> None:
+    if mode not in PG_LOAD_MODES:
+        raise ValueError(f"Mode load '{mode}' tidak dikenal. Pilihan: {', '.join(PG_LOAD_MODES)}")
+    if mode == "upsert":
+        changed = _upsert_rows(cur, df, table_name, method, batch_size, dedupe_existing)
+        logging.info(f"[PostgreSQL] Upsert: {changed} dari {len(df)} baris baru/berubah di tabel {table_name}")
+    else:
+        _write_rows(cur, df, table_name, method, batch_size)
+
+
+def load_to_postgres(
+    df: pd.DataFrame,
+    db_config: dict,
+    table_name: str = "etl_data",
+    method: str = "copy",
+    batch_size: int = PG_BATCH_SIZE,
+    mode: str = "append",
+    dedupe_existing: bool = False,
+) -> None:
+    """
+    Simpan DataFrame ke PostgreSQL dalam satu transaksi.
+    method "copy" (default) memakai COPY FROM STDIN, "values" memakai
+    execute_values; keduanya mengirim batch_size baris per batch.
+    mode "append" menambah semua baris, "upsert" hanya menulis produk
+    baru atau yang Price/Rating-nya berubah (lihat _upsert_rows).
+    dedupe_existing=True mengizinkan upsert pertama menghapus duplikat
+    lama dari mode append (lihat _backfill_fingerprints).
     db_config contoh:
     {
         "host": "localhost",
@@ -80,6 +529,8 @@ def load_to_postgres(df: pd.DataFrame, db_config: dict, table_name: str = "etl_d
         "port": 5432
     }
     """
+    import psycopg2
+
     if df is None or df.empty:
         raise ValueError("DataFrame kosong. Tidak bisa disimpan ke PostgreSQL.")
 
@@ -88,26 +539,8 @@ def load_to_postgres(df: pd.DataFrame, db_config: dict, table_name: str = "etl_d
         conn = psycopg2.connect(**db_config)
         cur = conn.cursor()
 
-        create_table_query = f"""
-        CREATE TABLE IF NOT EXISTS {table_name} (
-            id SERIAL PRIMARY KEY,
-            Title TEXT,
-            Price FLOAT,
-            Rating FLOAT,
-            Colors INT,
-            Size TEXT,
-            Gender TEXT,
-            Timestamp TIMESTAMP
-        )
-        """
-        cur.execute(create_table_query)
-
-        for _, row in df.iterrows():
-            cur.execute(
-                f"INSERT INTO {table_name} (Title, Price, Rating, Colors, Size, Gender, Timestamp) VALUES (%s, %s, %s, %s, %s, %s, %s)",
-                (row["Title"], float(row["Price"]), float(row["Rating"]), int(row["Colors"]),
-                row["Size"], row["Gender"], row["Timestamp"])
-            )
+        _create_table(cur, table_name)
+        _load_rows(cur, df, table_name, mode, method, batch_size, dedupe_existing)
 
         conn.commit()
         cur.close()
@@ -121,4 +554,163 @@ def load_to_postgres(df: pd.DataFrame, db_config: dict, table_name: str = "etl_d
             conn.close()
 
 
-__all__ = ["load_to_csv", "load_to_gsheets", "load_to_postgres"]
\ No newline at end of file
+class CsvStreamWriter:
+    """
+    Tulis DataFrame ke CSV secara bertahap (per chunk) dengan satu file
+    handle yang tetap terbuka, jadi memori tidak bergantung ukuran output.
+    - mode "snapshot": chunk ditulis ke file sementara di folder yang sama
+      dan baru menggantikan file tujuan (rename atomik) saat close().
+    - mode "append": chunk ditambahkan ke file yang ada; header hanya
+      ditulis bila file belum ada atau masih kosong.
+    compression "gzip" (atau nama file .gz) menulis CSV terkompresi;
+    pada mode append tiap run menjadi member gzip baru yang tetap bisa dibaca.
+    """
+
+    def __init__(
+        self,
+        filename: str = "products.csv",
+        directory: Optional[str] = None,
+        mode: str = "snapshot",
+        compression: Optional[str] = None,
+    ):
+        if mode not in ("snapshot", "append"):
+            raise ValueError(f"Mode CSV '{mode}' tidak dikenal. Pilihan: snapshot, append")
+        if compression not in (None, "gzip"):
+            raise ValueError(f"Kompresi '{compression}' tidak didukung. Pilihan: gzip")
+        self.path = os.path.join(directory, filename) if directory else filename
+        self.mode = mode
+        self.compression = compression or ("gzip" if self.path.endswith(".gz") else None)
+        self.rows = 0
+        self._tmp_path = f"{self.path}.tmp-{os.getpid()}" if mode == "snapshot" else None
+        self._handle = None
+        self._header_written = False
+
+    def _open(self):
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        if self.mode == "append":
+            target, file_mode = self.path, "a"
+            self._header_written = os.path.exists(self.path) and os.path.getsize(self.path) > 0
+        else:
+            target, file_mode = self._tmp_path, "w"
+        if self.compression == "gzip":
+            return gzip.open(target, file_mode + "t", encoding="utf-8", newline="")
+        return open(target, file_mode, encoding="utf-8", newline="")
+
+    def write(self, df: pd.DataFrame) -> None:
+        if df.empty:
+            return
+        if self._handle is None:
+            self._handle = self._open()
+        df.to_csv(self._handle, header=not self._header_written, index=False)
+        self._header_written = True
+        self.rows += len(df)
+
+    def close(self) -> None:
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+            if self.mode == "snapshot":
+                os.replace(self._tmp_path, self.path)
+        logging.info(f"[CSV] {self.rows} baris disimpan ke {self.path}")
+
+    def abort(self) -> None:
+        """
+        Tutup tanpa menerbitkan hasil: file sementara snapshot dihapus.
+        """
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+        if self._tmp_path and os.path.exists(self._tmp_path):
+            os.remove(self._tmp_path)
+
+
+class GSheetsStreamWriter:
+    """
+    Tulis DataFrame ke Google Sheets per chunk dengan append_rows.
+    Sheet dikosongkan dan header ditulis saat chunk pertama datang.
+    """
+
+    def __init__(self, spreadsheet_id: str):
+        self.spreadsheet_id = spreadsheet_id
+        self.rows = 0
+        self._sheet = None
+
+    def write(self, df: pd.DataFrame) -> None:
+        if df.empty:
+            return
+        df_for_gsheets = _df_for_gsheets(df)
+        values = df_for_gsheets.values.tolist()
+        if self._sheet is None:
+            self._sheet = _gsheets_client().open_by_key(self.spreadsheet_id).sheet1
+            self._sheet.clear()
+            values = [df_for_gsheets.columns.values.tolist()] + values
+        self._sheet.append_rows(values)
+        self.rows += len(df)
+
+    def close(self) -> None:
+        logging.info(f"[Google Sheets] {self.rows} baris disimpan ke spreadsheet {self.spreadsheet_id}")
+
+
+class PostgresStreamWriter:
+    """
+    Tulis DataFrame ke PostgreSQL per chunk. Setiap chunk di-commit
+    sendiri supaya data langsung terlihat selama pipeline berjalan.
+    """
+
+    def __init__(
+        self,
+        db_config: dict,
+        table_name: str = "etl_data",
+        method: str = "copy",
+        batch_size: int = PG_BATCH_SIZE,
+        mode: str = "append",
+        dedupe_existing: bool = False,
+    ):
+        self.db_config = db_config
+        self.table_name = table_name
+        self.method = method
+        self.batch_size = batch_size
+        self.mode = mode
+        self.dedupe_existing = dedupe_existing
+        self.rows = 0
+        self._conn = None
+
+    def write(self, df: pd.DataFrame) -> None:
+        if df.empty:
+            return
+        if self._conn is None:
+            import psycopg2
+
+            self._conn = psycopg2.connect(**self.db_config)
+            with self._conn.cursor() as cur:
+                _create_table(cur, self.table_name)
+        try:
+            with self._conn.cursor() as cur:
+                _load_rows(
+                    cur, df, self.table_name, self.mode, self.method, self.batch_size, self.dedupe_existing
+                )
+            self._conn.commit()
+        except Exception as e:
+            self._conn.rollback()
+            logging.error(f"Gagal menyimpan chunk ke PostgreSQL: {e}")
+            raise
+        self.rows += len(df)
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+        logging.info(f"[PostgreSQL] {self.rows} baris disimpan di tabel {self.table_name}")
+
+
+__all__ = [
+    "load_to_csv",
+    "load_to_gsheets",
+    "load_to_postgres",
+    "load_to_parquet",
+    "read_parquet_snapshots",
+    "CsvStreamWriter",
+    "GSheetsStreamWriter",
+    "PostgresStreamWriter",
+]
\ No newline at end of file
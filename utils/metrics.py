@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import bisect
+import json
+import logging
+import os
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+logging.basicConfig(level=logging.INFO, format="%(levelname)s - %(message)s")
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, object]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(key: LabelKey, extra: Sequence[Tuple[str, str]] = ()) -> str:
+    pairs = list(key) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+class _Histogram:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[int]:
+        total, out = 0, []
+        for c in self.counts:
+            total += c
+            out.append(total)
+        return out
+
+
+class MetricsRegistry:
+    """
+    Registry metrik sederhana dan thread-safe untuk satu run ETL:
+    counter (inc), gauge (set) dan histogram (observe), masing-masing
+    dengan label opsional. Hasilnya bisa diekspor sebagai laporan JSON
+    atau file teks format Prometheus (untuk textfile collector).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._help: Dict[str, Tuple[str, str]] = {}
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._gauges: Dict[str, Dict[LabelKey, float]] = {}
+        self._histograms: Dict[str, Dict[LabelKey, _Histogram]] = {}
+        self._buckets: Dict[str, Tuple[float, ...]] = {}
+
+    def describe(self, name: str, kind: str, help_text: str, buckets: Sequence[float] = LATENCY_BUCKETS) -> None:
+        with self._lock:
+            self._help[name] = (kind, help_text)
+            if kind == "histogram":
+                self._buckets[name] = tuple(buckets)
+
+    def inc(self, name: str, value: float = 1, **labels) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def set(self, name: str, value: float, **labels) -> None:
+        with self._lock:
+            self._gauges.setdefault(name, {})[_label_key(labels)] = value
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            hist = series.get(key)
+            if hist is None:
+                hist = series[key] = _Histogram(self._buckets.get(name, LATENCY_BUCKETS))
+            hist.observe(value)
+
+    def value(self, name: str, **labels) -> Optional[float]:
+        """
+        Nilai counter/gauge untuk label tertentu (None bila belum ada).
+        """
+        key = _label_key(labels)
+        with self._lock:
+            for store in (self._counters, self._gauges):
+                if key in store.get(name, {}):
+                    return store[name][key]
+        return None
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._histograms.clear()
+
+    def to_dict(self) -> dict:
+        def _series(store, render):
+            return {
+                name: [{"labels": dict(key), **render(v)} for key, v in sorted(series.items())]
+                for name, series in sorted(store.items())
+            }
+
+        with self._lock:
+            return {
+                "counters": _series(self._counters, lambda v: {"value": v}),
+                "gauges": _series(self._gauges, lambda v: {"value": v}),
+                "histograms": _series(
+                    self._histograms,
+                    lambda h: {
+                        "count": h.count,
+                        "sum": h.sum,
+                        "buckets": dict(zip([str(b) for b in h.buckets] + ["+Inf"], h.cumulative())),
+                    },
+                ),
+            }
+
+    def to_prometheus(self) -> str:
+        lines: List[str] = []
+
+        def _header(name: str, kind: str) -> None:
+            help_text = self._help.get(name, (kind, ""))[1]
+            if help_text:
+                lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        with self._lock:
+            for kind, store in (("counter", self._counters), ("gauge", self._gauges)):
+                for name, series in sorted(store.items()):
+                    _header(name, kind)
+                    for key, v in sorted(series.items()):
+                        lines.append(f"{name}{_format_labels(key)} {v}")
+            for name, series in sorted(self._histograms.items()):
+                _header(name, "histogram")
+                for key, h in sorted(series.items()):
+                    bounds = [str(b) for b in h.buckets] + ["+Inf"]
+                    for le, c in zip(bounds, h.cumulative()):
+                        lines.append(f"{name}_bucket{_format_labels(key, [('le', le)])} {c}")
+                    lines.append(f"{name}_sum{_format_labels(key)} {h.sum}")
+                    lines.append(f"{name}_count{_format_labels(key)} {h.count}")
+        return "\n".join(lines) + "\n"
+
+    def write_json(self, path: str, **extra) -> None:
+        """
+        Simpan laporan run (metrik + field tambahan) sebagai JSON.
+        """
+        _atomic_write_text(path, json.dumps({**extra, **self.to_dict()}, indent=2, default=str))
+        logging.info(f"Laporan metrik disimpan ke {path}")
+
+    def write_prometheus(self, path: str) -> None:
+        """
+        Simpan metrik dalam format teks Prometheus. Ditulis atomik supaya
+        textfile collector tidak pernah membaca file setengah jadi.
+        """
+        _atomic_write_text(path, self.to_prometheus())
+        logging.info(f"Metrik Prometheus disimpan ke {path}")
+
+
+def _atomic_write_text(path: str, text: str) -> None:
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp-{os.getpid()}-{threading.get_ident()}"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+REGISTRY = MetricsRegistry()
+
+REGISTRY.describe("etl_http_request_seconds", "histogram", "Latency request HTTP halaman katalog.")
+REGISTRY.describe("etl_http_requests_total", "counter", "Jumlah request HTTP per status.")
+REGISTRY.describe("etl_http_response_bytes_total", "counter", "Total byte body respons.")
+REGISTRY.describe("etl_parse_seconds", "histogram", "Waktu parsing HTML per halaman.")
+REGISTRY.describe("etl_pages_total", "counter", "Halaman yang diproses per hasil.")
+REGISTRY.describe("etl_transform_rows_in_total", "counter", "Baris mentah yang masuk transform.")
+REGISTRY.describe("etl_transform_rows_out_total", "counter", "Baris bersih yang keluar dari transform.")
+REGISTRY.describe("etl_transform_rows_dropped_total", "counter", "Baris yang dibuang transform per alasan.")
+REGISTRY.describe("etl_transform_seconds", "histogram", "Durasi satu panggilan transform.")
+REGISTRY.describe("etl_load_seconds", "histogram", "Durasi load per sink.")
+REGISTRY.describe("etl_load_rows_total", "counter", "Baris yang ditulis per sink.")
+REGISTRY.describe("etl_load_rows_per_second", "gauge", "Throughput load terakhir per sink.")
+
+
+__all__ = ["MetricsRegistry", "REGISTRY", "LATENCY_BUCKETS"]
@@ -0,0 +1,361 @@
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional, Protocol, Sequence, Tuple
+
+import pandas as pd
+
+from utils.archive import PageArchive
+from utils.cache import PageCache, SelectorMemo
+from utils.checkpoint import CheckpointStore
+from utils.extract import BASE_URL, DEFAULT_PARSER, TOTAL_PAGES, create_parse_pool, iter_pages
+from utils.fingerprint import FingerprintIndex
+from utils.metrics import REGISTRY
+from utils.profiling import StageProfiler
+from utils.throttle import AdaptiveThrottle
+from utils.transform import DEFAULT_ENGINE, transform_iter
+
+logging.basicConfig(level=logging.INFO, format="%(levelname)s - %(message)s")
+
+QUEUE_SIZE = 4
+
+_DONE = object()
+
+
+class StreamWriter(Protocol):
+    def write(self, df: pd.DataFrame) -> None: ...
+
+    def close(self) -> None: ...
+
+
+def _record_load(sink: str, seconds: float, rows: int) -> None:
+    REGISTRY.observe("etl_load_seconds", seconds, sink=sink)
+    REGISTRY.inc("etl_load_rows_total", rows, sink=sink)
+    if seconds > 0:
+        REGISTRY.set("etl_load_rows_per_second", rows / seconds, sink=sink)
+
+
+def _finish_writers(writers: Sequence[StreamWriter], failed: bool) -> None:
+    """
+    Tutup semua writer. Bila pipeline gagal, writer yang punya abort()
+    (misal snapshot CSV) membatalkan hasil setengah jadi alih-alih menerbitkannya.
+    """
+    for w in writers:
+        try:
+            if failed and hasattr(w, "abort"):
+                w.abort()
+            else:
+                w.close()
+        except Exception as e:
+            logging.error(f"Gagal menutup writer {type(w).__name__}: {e}")
+            if not failed:
+                raise
+
+
+def run_streaming(
+    writers: Sequence[StreamWriter],
+    pages: int = TOTAL_PAGES,
+    max_workers: int = 1,
+    queue_size: int = QUEUE_SIZE,
+    cache: PageCache | None = None,
+    parser: str = DEFAULT_PARSER,
+    memo: SelectorMemo | None = None,
+    engine: str = DEFAULT_ENGINE,
+    checkpoint: CheckpointStore | None = None,
+    resume: bool = False,
+    throttle: AdaptiveThrottle | None = None,
+    seen_index: FingerprintIndex | None = None,
+    parse_workers: int = 0,
+    base_url: str = BASE_URL,
+    archive: PageArchive | None = None,
+    replay: bool = False,
+    replay_as_of: datetime | str | None = None,
+) -> int:
+    """
+    Jalankan ETL secara streaming: setiap halaman hasil scrape langsung
+    ditransformasi lalu ditulis ke semua writer.
+    Extract berjalan di thread terpisah dan mengisi antrean berukuran
+    queue_size; bila transform/load lebih lambat, extract ikut menunggu
+    (backpressure) sehingga memori tidak tumbuh mengikuti jumlah halaman.
+    seen_index (FingerprintIndex) melewati produk yang sudah dimuat pada
+    run sebelumnya; fingerprint baru disimpan hanya bila run berhasil.
+    Mengembalikan jumlah baris yang ditulis.
+    """
+    batches: queue.Queue = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+    errors: List[BaseException] = []
+
+    def _put(item) -> bool:
+        while not stop.is_set():
+            try:
+                batches.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _produce() -> None:
+        try:
+            for batch in iter_pages(
+                pages,
+                max_workers,
+                cache=cache,
+                parser=parser,
+                memo=memo,
+                checkpoint=checkpoint,
+                resume=resume,
+                throttle=throttle,
+                base_url=base_url,
+                archive=archive,
+                replay=replay,
+                replay_as_of=replay_as_of,
+                parse_pool=parse_pool,
+            ):
+                if not _put(batch):
+                    return
+        except BaseException as e:
+            errors.append(e)
+        finally:
+            _put(_DONE)
+
+    # Pool parsing dibuat di thread pemanggil sebelum thread extract berjalan.
+    parse_pool = create_parse_pool(parse_workers)
+    producer = threading.Thread(target=_produce, name="etl-extract", daemon=True)
+    producer.start()
+
+    def _consume() -> Iterator[list]:
+        while True:
+            batch = batches.get()
+            if batch is _DONE:
+                return
+            yield batch
+
+    total = 0
+    failed = True
+    try:
+        for df in transform_iter(_consume(), engine, seen_index):
+            for w in writers:
+                start = time.perf_counter()
+                w.write(df)
+                _record_load(type(w).__name__, time.perf_counter() - start, len(df))
+            total += len(df)
+        failed = bool(errors)
+    finally:
+        stop.set()
+        producer.join()
+        if parse_pool is not None:
+            parse_pool.shutdown(cancel_futures=True)
+        _finish_writers(writers, failed)
+
+    if seen_index is not None:
+        if errors:
+            seen_index.rollback()
+        else:
+            seen_index.commit()
+    if errors:
+        raise errors[0]
+    logging.info(f"Streaming selesai: {total} baris ditulis.")
+    return total
+
+
+@dataclass
+class SinkSpec:
+    """
+    Satu sink yang bisa dipilih dari CLI. load(df, options) dipakai pada
+    mode batch, stream(options) membuat StreamWriter untuk mode streaming
+    (None bila sink tidak mendukung streaming). requires berisi kunci
+    options yang wajib terisi. appends(options) bernilai True bila sink
+    hanya menambah baris (bukan mengganti seluruh isinya), sehingga aman
+    diberi data yang sudah disaring seen_index. Dependensi berat (gspread,
+    psycopg2, pyarrow) baru diimpor oleh utils.load saat sink benar-benar dipakai.
+    """
+
+    name: str
+    load: Callable[[pd.DataFrame, Dict[str, Any]], Any]
+    stream: Optional[Callable[[Dict[str, Any]], StreamWriter]] = None
+    requires: Tuple[str, ...] = ()
+    appends: Callable[[Dict[str, Any]], bool] = lambda options: False
+
+
+SINKS: Dict[str, SinkSpec] = {}
+
+
+def register_sink(
+    name: str,
+    load: Callable[[pd.DataFrame, Dict[str, Any]], Any],
+    stream: Optional[Callable[[Dict[str, Any]], StreamWriter]] = None,
+    requires: Tuple[str, ...] = (),
+    appends: Callable[[Dict[str, Any]], bool] = lambda options: False,
+) -> SinkSpec:
+    SINKS[name] = SinkSpec(name, load, stream, requires, appends)
+    return SINKS[name]
+
+
+def _sink_specs(names: Sequence[str], options: Dict[str, Any], streaming: bool) -> List[SinkSpec]:
+    specs = []
+    for name in names:
+        if name not in SINKS:
+            raise ValueError(f"Sink '{name}' tidak dikenal. Pilihan: {', '.join(SINKS)}")
+        spec = SINKS[name]
+        missing = [key for key in spec.requires if not options.get(key)]
+        if missing:
+            raise ValueError(f"Sink '{name}' membutuhkan opsi: {', '.join(missing)}")
+        if streaming and spec.stream is None:
+            raise ValueError(f"Sink '{name}' tidak mendukung mode streaming.")
+        specs.append(spec)
+    return specs
+
+
+def build_sinks(names: Sequence[str], options: Dict[str, Any]) -> Dict[str, Callable[[pd.DataFrame], Any]]:
+    """
+    Sink terpilih dalam bentuk {nama: fungsi(df)} untuk run_sinks.
+    """
+    return {
+        spec.name: (lambda df, spec=spec: spec.load(df, options))
+        for spec in _sink_specs(names, options, streaming=False)
+    }
+
+
+def build_writers(names: Sequence[str], options: Dict[str, Any]) -> List[StreamWriter]:
+    """
+    StreamWriter untuk setiap sink terpilih, untuk run_streaming.
+    """
+    return [spec.stream(options) for spec in _sink_specs(names, options, streaming=True)]
+
+
+def snapshot_sinks(names: Sequence[str], options: Dict[str, Any]) -> List[str]:
+    """
+    Sink terpilih yang mengganti seluruh isinya setiap run (misal CSV
+    snapshot, Google Sheets, Parquet). Sink seperti ini tidak boleh diberi
+    data yang sudah disaring seen_index: produk lama akan ikut terhapus.
+    """
+    return [name for name in names if name in SINKS and not SINKS[name].appends(options)]
+
+
+def _register_builtin_sinks() -> None:
+    from utils import load
+
+    register_sink(
+        "csv",
+        lambda df, o: load.load_to_csv(
+            df, o.get("csv_filename") or "products.csv", o.get("csv_dir"), mode=o.get("csv_mode") or "snapshot",
+        ),
+        lambda o: load.CsvStreamWriter(
+            o.get("csv_filename") or "products.csv", o.get("csv_dir"), mode=o.get("csv_mode") or "snapshot",
+        ),
+        appends=lambda o: o.get("csv_mode") == "append",
+    )
+    register_sink(
+        "gsheets",
+        lambda df, o: load.load_to_gsheets(df, spreadsheet_id=o["spreadsheet_id"]),
+        lambda o: load.GSheetsStreamWriter(o["spreadsheet_id"]),
+        requires=("spreadsheet_id",),
+    )
+    register_sink(
+        "postgres",
+        lambda df, o: load.load_to_postgres(
+            df, o["db_config"], o.get("pg_table") or "etl_data",
+            method=o.get("pg_method") or "copy", mode=o.get("pg_mode") or "append",
+            dedupe_existing=bool(o.get("pg_dedupe_existing")),
+        ),
+        lambda o: load.PostgresStreamWriter(
+            o["db_config"], o.get("pg_table") or "etl_data",
+            method=o.get("pg_method") or "copy", mode=o.get("pg_mode") or "append",
+            dedupe_existing=bool(o.get("pg_dedupe_existing")),
+        ),
+        requires=("db_config",),
+        appends=lambda o: True,
+    )
+    register_sink(
+        "parquet",
+        lambda df, o: load.load_to_parquet(df, o["parquet_dir"]),
+        requires=("parquet_dir",),
+    )
+
+
+_register_builtin_sinks()
+
+
+@dataclass
+class SinkResult:
+    name: str
+    ok: bool
+    seconds: float
+    rows: int
+    error: Optional[BaseException] = None
+
+
+def _run_sink(name: str, sink: Callable[[pd.DataFrame], Any], df: pd.DataFrame) -> SinkResult:
+    start = time.perf_counter()
+    try:
+        sink(df)
+    except Exception as e:
+        seconds = time.perf_counter() - start
+        logging.error(f"[Load] {name} gagal setelah {seconds:.2f} detik: {e}")
+        return SinkResult(name, False, seconds, 0, e)
+    seconds = time.perf_counter() - start
+    logging.info(f"[Load] {name} selesai dalam {seconds:.2f} detik")
+    _record_load(name, seconds, len(df))
+    return SinkResult(name, True, seconds, len(df))
+
+
+def run_sinks(
+    df: pd.DataFrame,
+    sinks: Dict[str, Callable[[pd.DataFrame], Any]],
+    max_workers: Optional[int] = None,
+    profiler: StageProfiler | None = None,
+    skip_empty: bool = False,
+) -> Dict[str, SinkResult]:
+    """
+    Kirim DataFrame yang sama ke semua sink secara paralel (satu thread per
+    sink). Kegagalan satu sink tidak menghentikan sink lain; hasil, durasi,
+    dan error tiap sink dikembalikan sesuai urutan `sinks`.
+    Dengan profiler aktif, sink dijalankan berurutan di thread pemanggil
+    dan masing-masing diprofil sebagai tahap "load-<nama>".
+    skip_empty=True membuat DataFrame kosong tidak dikirim ke sink dan
+    dianggap berhasil; pakai hanya bila kosongnya memang wajar (misal semua
+    produk sudah dimuat sebelumnya menurut seen_index). Tanpa itu sink
+    menolak DataFrame kosong seperti biasa.
+    """
+    if not sinks:
+        return {}
+    if skip_empty and df.empty:
+        logging.info("[Load] Tidak ada baris baru, semua sink dilewati.")
+        return {name: SinkResult(name, True, 0.0, 0) for name in sinks}
+    if profiler and profiler.enabled:
+        results = {}
+        for name, sink in sinks.items():
+            with profiler.stage(f"load-{name}"):
+                results[name] = _run_sink(name, sink, df)
+    else:
+        with ThreadPoolExecutor(max_workers=max_workers or len(sinks), thread_name_prefix="etl-load") as pool:
+            futures = {name: pool.submit(_run_sink, name, sink, df) for name, sink in sinks.items()}
+            results = {name: f.result() for name, f in futures.items()}
+
+    failed = [r.name for r in results.values() if not r.ok]
+    summary = ", ".join(f"{r.name}={'OK' if r.ok else 'GAGAL'} ({r.seconds:.2f}s)" for r in results.values())
+    if failed:
+        logging.error(f"[Load] Ringkasan: {summary}")
+    else:
+        logging.info(f"[Load] Ringkasan: {summary}")
+    return results
+
+
+__all__ = [
+    "run_streaming",
+    "run_sinks",
+    "SinkResult",
+    "StreamWriter",
+    "SinkSpec",
+    "SINKS",
+    "register_sink",
+    "build_sinks",
+    "build_writers",
+    "snapshot_sinks",
+]
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import contextlib
+import cProfile
+import io
+import json
+import logging
+import os
+import pstats
+import time
+import tracemalloc
+from typing import Dict, Iterator, Optional
+
+logging.basicConfig(level=logging.INFO, format="%(levelname)s - %(message)s")
+
+TOP_FUNCTIONS = 30
+TOP_ALLOCATORS = 20
+
+
+class StageProfiler:
+    """
+    Profil per tahap ETL (extract, transform, tiap load) dengan cProfile
+    dan tracemalloc. Untuk setiap tahap ditulis ke `directory`:
+    - <tahap>.pstats: data cProfile (bisa dibuka snakeviz, flameprof,
+      gprof2dot untuk flamegraph)
+    - <tahap>.txt: fungsi teratas menurut waktu kumulatif
+    - <tahap>-memory.txt: baris kode yang paling banyak mengalokasikan memori
+    serta ringkasan semua tahap di summary.json.
+    Tanpa directory profiler nonaktif dan stage() hanya context manager kosong.
+    cProfile hanya melihat thread pemanggil, jadi kerja tahap yang diprofil
+    sebaiknya berjalan di thread yang sama (lihat run_sinks/iter_pages).
+    """
+
+    def __init__(self, directory: Optional[str] = None, top: int = TOP_ALLOCATORS):
+        self.directory = directory
+        self.top = top
+        self.summary: Dict[str, dict] = {}
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.directory)
+
+    def stage(self, name: str):
+        if not self.enabled:
+            return contextlib.nullcontext()
+        return self._profile(name)
+
+    @contextlib.contextmanager
+    def _profile(self, name: str) -> Iterator[None]:
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        before = tracemalloc.take_snapshot()
+        profile = cProfile.Profile()
+        start = time.perf_counter()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            seconds = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            after = tracemalloc.take_snapshot()
+            if started_tracing:
+                tracemalloc.stop()
+            self._write(name, profile, after.compare_to(before, "lineno"), seconds, peak)
+
+    def _write(self, name: str, profile: cProfile.Profile, allocations, seconds: float, peak: int) -> None:
+        base = os.path.join(self.directory, name)
+        profile.dump_stats(f"{base}.pstats")
+
+        text = io.StringIO()
+        pstats.Stats(profile, stream=text).sort_stats("cumulative").print_stats(TOP_FUNCTIONS)
+        with open(f"{base}.txt", "w", encoding="utf-8") as f:
+            f.write(text.getvalue())
+
+        top = [a for a in allocations if a.size_diff > 0][: self.top]
+        with open(f"{base}-memory.txt", "w", encoding="utf-8") as f:
+            f.write(f"Puncak memori tahap {name}: {peak / 1024 / 1024:.2f} MiB\n")
+            for a in top:
+                f.write(f"{a.size_diff / 1024:10.1f} KiB  {a.count_diff:+8d} blok  {a.traceback}\n")
+
+        self.summary[name] = {
+            "seconds": round(seconds, 4),
+            "peak_memory_bytes": peak,
+            "top_allocators": [
+                {"where": str(a.traceback), "bytes": a.size_diff, "blocks": a.count_diff} for a in top[:5]
+            ],
+        }
+        with open(os.path.join(self.directory, "summary.json"), "w", encoding="utf-8") as f:
+            json.dump(self.summary, f, indent=2)
+        logging.info(
+            f"[Profil] {name}: {seconds:.2f} detik, puncak memori {peak / 1024 / 1024:.1f} MiB -> {base}.pstats"
+        )
+
+
+__all__ = ["StageProfiler"]
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, Optional
+
+logging.basicConfig(level=logging.INFO, format="%(levelname)s - %(message)s")
+
+BACKOFF_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Ubah header Retry-After (detik atau tanggal HTTP) menjadi jumlah detik.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class AdaptiveThrottle:
+    """
+    Pembatas laju request dengan pola AIMD (additive increase,
+    multiplicative decrease), dipakai bersama oleh semua worker.
+    - Selama respons sehat dan latency di bawah target_latency, laju naik
+      `increase` request/detik setiap respons.
+    - Respons 429/5xx, error jaringan, atau latency di atas target membuat
+      laju dikali `decrease`.
+    - Retry-After dari server dihormati: tidak ada request baru sebelum waktunya.
+    Laju saat ini tersedia di properti `rate` (request/detik).
+    """
+
+    def __init__(
+        self,
+        initial_rate: float = 2.0,
+        min_rate: float = 0.2,
+        max_rate: float = 50.0,
+        increase: float = 0.5,
+        decrease: float = 0.5,
+        target_latency: float = 2.0,
+        max_attempts: int = 4,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.target_latency = target_latency
+        self.max_attempts = max_attempts
+        self._rate = min(max(initial_rate, min_rate), max_rate)
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+        self._blocked_until = 0.0
+
+    @property
+    def rate(self) -> float:
+        with self._lock:
+            return self._rate
+
+    def acquire(self) -> None:
+        """
+        Tunggu sampai giliran request berikutnya sesuai laju saat ini.
+        """
+        with self._lock:
+            now = self._clock()
+            slot = max(now, self._next_slot, self._blocked_until)
+            self._next_slot = slot + 1.0 / self._rate
+        if slot > now:
+            self._sleep(slot - now)
+
+    def record(self, status: Optional[int], latency: float, retry_after: Optional[float] = None) -> None:
+        """
+        Laporkan hasil satu request. status None berarti error jaringan.
+        """
+        with self._lock:
+            if status is None or status in BACKOFF_STATUSES:
+                self._rate = max(self.min_rate, self._rate * self.decrease)
+                if retry_after:
+                    self._blocked_until = max(self._blocked_until, self._clock() + retry_after)
+                logging.info(f"Throttle turun ke {self._rate:.2f} req/s (status {status})")
+            elif latency > self.target_latency:
+                self._rate = max(self.min_rate, self._rate * self.decrease)
+            else:
+                self._rate = min(self.max_rate, self._rate + self.increase)
+
+
+__all__ = ["AdaptiveThrottle", "parse_retry_after", "BACKOFF_STATUSES"]
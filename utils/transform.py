@@ -2,15 +2,28 @@ from __future__ import annotations
 
 import logging
 import re
-from typing import List, Dict
+import time
+from typing import Dict, Iterable, Iterator, List, Protocol, Union
 
+import numpy as np
 import pandas as pd
 
+from utils.fingerprint import FingerprintIndex
+from utils.metrics import REGISTRY
+
 logging.basicConfig(level=logging.INFO, format="%(levelname)s - %(message)s")
 
 RUPIAH_RATE = 16000
 INVALID_TITLE = "Unknown Product"
 INVALID_RATING_TEXT = "Invalid Rating"
+DEDUP_COLUMNS = ["Title", "Price", "Rating", "Colors", "Size", "Gender"]
+ENGINES = ("python", "vectorized")
+DEFAULT_ENGINE = "vectorized"
+
+FLOAT_RE = re.compile(r"(\d+(?:\.\d+)?)")
+INT_RE = re.compile(r"(\d+)")
+SIZE_PREFIX_RE = re.compile(rf"(?i)^{re.escape('Size:')}\s*")
+GENDER_PREFIX_RE = re.compile(rf"(?i)^{re.escape('Gender:')}\s*")
 
 
 def _to_float_from_text(text: str) -> float | None:
@@ -19,7 +32,7 @@ def _to_float_from_text(text: str) -> float | None:
     """
     if not isinstance(text, str):
         return None
-    m = re.search(r"(\d+(?:\.\d+)?)", text)
+    m = FLOAT_RE.search(text)
     if m:
         try:
             return float(m.group(1))
@@ -34,7 +47,7 @@ def _to_int_from_text(text: str) -> int | None:
     """
     if not isinstance(text, str):
         return None
-    m = re.search(r"(\d+)", text)
+    m = INT_RE.search(text)
     if m:
         try:
             return int(m.group(1))
@@ -52,48 +65,166 @@ def _clean_prefix(text: str, prefix: str) -> str:
     return re.sub(rf"(?i)^{re.escape(prefix)}\s*", "", text).strip()
 
 
-def transform(rows: List[Dict[str, str]]) -> pd.DataFrame:
+def _text_values(series: pd.Series) -> pd.Series:
+    """
+    Kembalikan series yang aman untuk accessor .str; kolom non-teks
+    (misal semua angka) dianggap tidak valid seperti pada helper per baris.
+    """
+    if series.dtype == object or isinstance(series.dtype, pd.StringDtype):
+        return series
+    return pd.Series(np.nan, index=series.index, dtype=object)
+
+
+def _float_column(series: pd.Series) -> pd.Series:
+    """
+    Versi vektor dari _to_float_from_text untuk satu kolom.
+    """
+    extracted = _text_values(series).str.extract(FLOAT_RE, expand=False)
+    return extracted.astype("float64")
+
+
+def _int_column(series: pd.Series) -> pd.Series:
+    """
+    Versi vektor dari _to_int_from_text untuk satu kolom.
+    """
+    extracted = _text_values(series).str.extract(INT_RE, expand=False)
+    return pd.to_numeric(extracted)
+
+
+def _strip_prefix_column(series: pd.Series, pattern: re.Pattern) -> pd.Series:
+    """
+    Versi vektor dari _clean_prefix untuk satu kolom.
+    """
+    return series.astype(str).str.replace(pattern, "", regex=True).str.strip()
+
+
+def _factorized(series: pd.Series, convert) -> pd.Series:
+    """
+    Jalankan `convert` hanya pada nilai unik kolom lalu petakan kembali
+    lewat kode faktorisasi. Kolom seperti Size/Gender/Rating hanya punya
+    sedikit nilai berbeda, jadi parsing per baris tidak perlu diulang.
+    """
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    if len(uniques) == 0:
+        return pd.Series(np.nan, index=series.index, dtype="float64")
+    parsed = pd.Index(convert(pd.Series(uniques)))
+    return pd.Series(parsed.take(codes, allow_fill=True), index=series.index)
+
+
+def _convert_python(df: pd.DataFrame) -> pd.DataFrame:
+    def _usd_to_idr(text: str) -> float | None:
+        val = _to_float_from_text(text)
+        if val is None:
+            return None
+        return val * RUPIAH_RATE
+
+    df["Price"] = df["Price"].apply(_usd_to_idr)
+    df["Rating"] = df["Rating"].apply(_to_float_from_text)
+    df["Colors"] = df["Colors"].apply(_to_int_from_text)
+    df["Size"] = df["Size"].astype(str).apply(lambda x: _clean_prefix(x, "Size:"))
+    df["Gender"] = df["Gender"].astype(str).apply(lambda x: _clean_prefix(x, "Gender:"))
+    return df
+
+
+def _convert_vectorized(df: pd.DataFrame) -> pd.DataFrame:
+    df["Price"] = _factorized(df["Price"], lambda s: _float_column(s) * RUPIAH_RATE)
+    df["Rating"] = _factorized(df["Rating"], _float_column)
+    df["Colors"] = _factorized(df["Colors"], _int_column)
+    df["Size"] = _factorized(
+        df["Size"].astype(str), lambda s: _strip_prefix_column(s, SIZE_PREFIX_RE)
+    )
+    df["Gender"] = _factorized(
+        df["Gender"].astype(str), lambda s: _strip_prefix_column(s, GENDER_PREFIX_RE)
+    )
+    return df
+
+
+RawRows = Union[List[Dict[str, str]], "ColumnBatch"]
+
+
+class ColumnBatch(Protocol):
+    def __len__(self) -> int: ...
+
+    def to_frame(self) -> pd.DataFrame: ...
+
+
+_CONVERTERS = {"python": _convert_python, "vectorized": _convert_vectorized}
+
+
+def _drop_counted(df: pd.DataFrame, keep: pd.Series, reason: str) -> pd.DataFrame:
+    """
+    Simpan baris dengan keep=True; jumlah yang dibuang dicatat per alasan.
+    """
+    dropped = int((~keep).sum())
+    if not dropped:
+        return df
+    REGISTRY.inc("etl_transform_rows_dropped_total", dropped, reason=reason)
+    return df[keep]
+
+
+def transform(
+    rows: RawRows,
+    engine: str = DEFAULT_ENGINE,
+    seen_index: FingerprintIndex | None = None,
+) -> pd.DataFrame:
     """
     Membersihkan dan mengonversi data sesuai rubric.
     - Price (USD string) -> Rupiah (float) * 16.000
     - Rating -> float
     - Colors -> int
-    - Size -> string tanpa "Size: "
-    - Gender -> string tanpa "Gender: "
+    - Size -> category tanpa "Size: "
+    - Gender -> category tanpa "Gender: "
     - Timestamp -> datetime
     - Hapus null, duplikat, invalid
+    engine "vectorized" memakai accessor .str pandas dan hanya mem-parse
+    nilai unik tiap kolom, "python" memakai helper per baris; keduanya
+    menghasilkan DataFrame yang identik.
+    rows boleh berupa list of dict atau objek kolom yang punya to_frame()
+    (misal ProductColumns dari extract_all(as_columns=True)).
+    seen_index (FingerprintIndex) membuang produk yang sudah dimuat pada
+    run sebelumnya; fingerprint produk baru dicatat sebagai pending dan
+    disimpan saat seen_index.commit().
     """
+    df = _transform(rows, engine, seen_index)
+    REGISTRY.inc("etl_transform_rows_out_total", len(df))
+    logging.info(f"Transform: hasil {len(df)} baris setelah pembersihan.")
+    return df
+
+
+def _transform(
+    rows: RawRows,
+    engine: str = DEFAULT_ENGINE,
+    seen_index: FingerprintIndex | None = None,
+) -> pd.DataFrame:
+    """
+    Isi transform tanpa mencatat etl_transform_rows_out_total, supaya
+    transform_iter bisa menghitung baris keluar setelah dedupe antar chunk.
+    """
+    if engine not in _CONVERTERS:
+        raise ValueError(f"Engine '{engine}' tidak dikenal. Pilihan: {', '.join(ENGINES)}")
+
     if not rows:
         logging.warning("Tidak ada data untuk ditransformasi.")
         return pd.DataFrame(
             columns=["Title", "Price", "Rating", "Colors", "Size", "Gender", "Timestamp"]
         )
 
-    df = pd.DataFrame(rows)
+    start = time.perf_counter()
+    df = rows.to_frame() if hasattr(rows, "to_frame") else pd.DataFrame(rows)
+    REGISTRY.inc("etl_transform_rows_in_total", len(df))
 
     required_cols = ["Title", "Price", "Rating", "Colors", "Size", "Gender", "Timestamp"]
     for col in required_cols:
         if col not in df.columns:
             raise KeyError(f"Kolom wajib '{col}' tidak ditemukan pada data hasil extract.")
 
-    df.dropna(subset=["Title", "Price"], inplace=True)
+    df = _drop_counted(df, df[["Title", "Price"]].notna().all(axis=1), "missing_field")
+    df = _drop_counted(df, df["Title"].astype(str).str.strip().ne(INVALID_TITLE), "invalid_title")
+    df = _drop_counted(df, df["Rating"].astype(str).str.strip().ne(INVALID_RATING_TEXT), "invalid_rating")
 
-    df = df[df["Title"].astype(str).str.strip().ne(INVALID_TITLE)]
-    df = df[df["Rating"].astype(str).str.strip().ne(INVALID_RATING_TEXT)]
+    df = _CONVERTERS[engine](df)
 
-    def _usd_to_idr(text: str) -> float | None:
-        val = _to_float_from_text(text)
-        if val is None:
-            return None
-        return val * RUPIAH_RATE
-
-    df["Price"] = df["Price"].apply(_usd_to_idr)
-    df["Rating"] = df["Rating"].apply(_to_float_from_text)
-    df["Colors"] = df["Colors"].apply(_to_int_from_text)
-    df["Size"] = df["Size"].astype(str).apply(lambda x: _clean_prefix(x, "Size:"))
-    df["Gender"] = df["Gender"].astype(str).apply(lambda x: _clean_prefix(x, "Gender:"))
-
-    df.dropna(subset=["Title", "Price", "Rating", "Colors", "Size", "Gender", "Timestamp"], inplace=True)
+    df = _drop_counted(df, df[required_cols].notna().all(axis=1), "unparseable")
 
     df = df.astype(
         {
@@ -101,18 +232,73 @@ def transform(rows: List[Dict[str, str]]) -> pd.DataFrame:
             "Price": "float64",
             "Rating": "float64",
             "Colors": "int64",
-            "Size": "string",
-            "Gender": "string",
+            "Size": "category",
+            "Gender": "category",
             "Timestamp": "datetime64[ns]",
         }
     )
 
-    df.drop_duplicates(
-        subset=["Title", "Price", "Rating", "Colors", "Size", "Gender"], inplace=True
-    )
+    df = _drop_counted(df, ~df.duplicated(subset=DEDUP_COLUMNS), "duplicate")
 
-    logging.info(f"Transform: hasil {len(df)} baris setelah pembersihan.")
+    if seen_index is not None and not df.empty:
+        fingerprints = _fingerprints(df)
+        seen = seen_index.contains(fingerprints)
+        seen_index.add(fingerprints[~seen])
+        df = _drop_counted(df, pd.Series(~seen, index=df.index), "already_seen")
+
+    REGISTRY.observe("etl_transform_seconds", time.perf_counter() - start, engine=engine)
     return df.reset_index(drop=True)
 
 
-__all__ = ["transform"]
\ No newline at end of file
+def _fingerprints(df: pd.DataFrame) -> np.ndarray:
+    """
+    Hash 64-bit per baris dari kolom DEDUP_COLUMNS.
+    """
+    return pd.util.hash_pandas_object(df[DEDUP_COLUMNS], index=False).to_numpy()
+
+
+def _sorted_contains(sorted_values: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """
+    Mask boolean: True bila nilai ada di array terurut sorted_values.
+    """
+    if not len(sorted_values):
+        return np.zeros(len(values), dtype=bool)
+    pos = np.searchsorted(sorted_values, values)
+    return sorted_values[np.minimum(pos, len(sorted_values) - 1)] == values
+
+
+def transform_iter(
+    chunks: Iterable[RawRows],
+    engine: str = DEFAULT_ENGINE,
+    seen_index: FingerprintIndex | None = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    Versi bertahap dari transform: setiap batch baris mentah dibersihkan
+    sendiri lalu di-yield sebagai DataFrame. Duplikat antar chunk dibuang
+    dengan array fingerprint 64-bit terurut (uint64, sekitar 8 byte per
+    baris unik), jadi yang disimpan hanya hash, bukan seluruh data yang
+    sudah lewat. Chunk yang kosong setelah dibersihkan tidak di-yield.
+    seen_index: lihat transform.
+    """
+    seen = np.empty(0, dtype=np.uint64)
+    rows_out = 0
+    for rows in chunks:
+        df = _transform(rows, engine, seen_index)
+        if df.empty:
+            continue
+        fingerprints = _fingerprints(df).astype(np.uint64, copy=False)
+        mask = ~_sorted_contains(seen, fingerprints)
+        new = np.unique(fingerprints[mask])
+        seen = np.insert(seen, np.searchsorted(seen, new), new)
+        if not mask.all():
+            df = df[mask].reset_index(drop=True)
+            REGISTRY.inc("etl_transform_rows_dropped_total", int((~mask).sum()), reason="duplicate")
+        if df.empty:
+            continue
+        REGISTRY.inc("etl_transform_rows_out_total", len(df))
+        rows_out += len(df)
+        yield df
+    logging.info(f"Transform bertahap: total {rows_out} baris unik.")
+
+
+__all__ = ["transform", "transform_iter", "ENGINES", "DEFAULT_ENGINE"]
\ No newline at end of file